@@ -8,6 +8,21 @@ from streamlit_js_eval import streamlit_js_eval as js
 import base64
 import json
 import hashlib
+import requests
+
+from api_client import api_get
+from categories import CATEGORIES, CATEGORY_ID_TO_NAME  # noqa: F401 (re-exported)
+from shared_cache import SharedCache
+
+TOKEN_VERIFY_TTL = 300  # Seconds before an accepted or rejected token is re-checked
+TOKEN_RETRY_TTL = 30  # Seconds before a check that could not reach the backend is retried
+TOKEN_VERIFY_TIMEOUT = 5  # Seconds; the check is made once, without retries
+TOKEN_SCOPE_TTL = 24 * 3600  # Seconds the last verified scope is kept
+
+# Outcome of the last backend check of each token ("accepted", "rejected" or
+# "unreachable") and the last verified scope, both keyed by token hash
+_token_checks = SharedCache(max_entries=256, ttl=TOKEN_VERIFY_TTL)
+_verified_scopes = SharedCache(max_entries=256, ttl=TOKEN_SCOPE_TTL)
 
 def logout_user():
     """Properly cleanup session state and browser storage"""
@@ -195,26 +210,6 @@ st.set_page_config(
     },
 )
 
-# Categories data
-CATEGORIES = {
-    "Fables": "379d6867-57c1-4f57-b6ee-fb734313e538",
-    "Events": "7a184c41-1a49-4beb-a01a-d8dc01693b15",
-    "Music": "94979e9f-4895-4cd7-8601-ad53d8099bf4",
-    "Places": "96e5104f-c786-4928-b932-f59f5b4ddbf0",
-    "Food": "833299f6-ff1c-4fde-804f-6d3b3877c76e",
-    "People": "af8b7a27-00b4-4192-9fa6-90152a0640b2",
-    "Literature": "74b133e7-e496-4e9d-85b0-3bd5eb4c3871",
-    "Architecture": "94a13c20-8a03-45da-8829-10e2fe1e61a1",
-    "Skills": "6f6f5023-a99e-4a29-a44a-6d5acbf88085",
-    "Images": "4366cab1-031e-4b37-816b-311ee34461a9",
-    "Culture": "ab9fa2ce-1f83-4e91-b89d-cca18e8b301e",
-    "Flora & Fauna": "5f40610f-ae47-4472-944c-cb899128ebbf",
-    "Education": "784ddb92-9540-4ce1-b4e4-6c1b7b18849d",
-    "Vegetation": "2f831ae2-f0cd-4142-8646-68dd195dfba2",
-    "Dance": "3fa85f64-5717-4562-b3fc-2c963f66afa6",
-}
-
-CATEGORY_ID_TO_NAME = {v: k for k, v in CATEGORIES.items()}
 
 
 # Initialize enhanced session state
@@ -237,6 +232,7 @@ def initialize_session_state():
         "comparison_data": {},
         "real_time_updates": False,
         "export_format": "csv",
+        "export_compress": False,
         "chart_theme": "dark",
         "auto_refresh": False,
         "notifications": [],
@@ -304,6 +300,79 @@ def decode_jwt_token(token: str) -> Optional[Dict]:
         logger.error(f"Failed to decode token: {e}")
         return None
 
+def verify_token(token: str) -> str:
+    """Check the token with the backend (one one-record /records/ request)
+
+    Returns "accepted", "rejected" (401/403) or "unreachable" (connection
+    errors, timeouts and any other response).
+    """
+    try:
+        response = api_get(
+            "/records/", token, params={"skip": 0, "limit": 1},
+            timeout=TOKEN_VERIFY_TIMEOUT, retry=False,
+        )
+    except requests.exceptions.RequestException as e:
+        logger.warning(f"Could not verify token with the backend: {e}")
+        return "unreachable"
+    if response.ok:
+        return "accepted"
+    if response.status_code in (401, 403):
+        return "rejected"
+    logger.warning(f"Could not verify token with the backend: HTTP {response.status_code}")
+    return "unreachable"
+
+def _token_check(token: str) -> str:
+    """The cached outcome of `verify_token`; unreachable checks expire sooner"""
+    key = hash_token(token)
+    outcome = _token_checks.get(key)
+    if outcome is None:
+        outcome = verify_token(token)
+        ttl = TOKEN_RETRY_TTL if outcome == "unreachable" else TOKEN_VERIFY_TTL
+        _token_checks.set(key, outcome, ttl=ttl)
+    return outcome
+
+def _claims_scope(token_data: Dict) -> str:
+    payload = token_data["payload"]
+    for claim in ("role", "roles", "scope", "scopes", "permissions"):
+        value = payload.get(claim)
+        if value:
+            if isinstance(value, (list, tuple)):
+                value = ",".join(sorted(str(v) for v in value))
+            return f"{claim}:{value}"
+
+    return f"user:{token_data['user_id']}"
+
+def get_auth_scope(token: str) -> str:
+    """Derive the shared-cache scope of a token from its role claims
+
+    The claims are only trusted once the backend has accepted the token
+    (re-checked every `TOKEN_VERIFY_TTL` seconds): verified tokens carrying
+    the same role share cached datasets, and tokens without role claims are
+    scoped to their own user. While the backend is unreachable a token keeps
+    its last verified scope, so cached data and the local records copy stay
+    available. Tokens never verified, rejected or expired get a scope of
+    their own, so they are never served data cached for someone else.
+    """
+    token_data = decode_jwt_token(token) if token else None
+    own_scope = f"token:{hash_token(token or '')}"
+    if not token_data:
+        return own_scope
+
+    key = hash_token(token)
+    expires_at = token_data.get("expires_at")
+    if expires_at and expires_at < time.time():
+        return own_scope
+
+    outcome = _token_check(token)
+    if outcome == "accepted":
+        scope = _claims_scope(token_data)
+        _verified_scopes.set(key, scope)
+        return scope
+    if outcome == "rejected":
+        _verified_scopes.invalidate(lambda k: k == key)
+        return own_scope
+    return _verified_scopes.get(key) or own_scope
+
 def check_token_renewal():
     """Check if token needs renewal and handle it"""
     token = st.session_state.get("token")
@@ -0,0 +1,94 @@
+# Shared HTTP client for the backend2.swecha.org API
+import os
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+API_BASE_URL = "https://backend2.swecha.org/api/v1"
+
+# Connection pool and retry settings (overridable through the environment)
+POOL_SIZE = int(os.environ.get("SWECHA_API_POOL_SIZE", "16"))
+MAX_RETRIES = int(os.environ.get("SWECHA_API_MAX_RETRIES", "3"))
+BACKOFF_FACTOR = float(os.environ.get("SWECHA_API_BACKOFF_FACTOR", "0.5"))
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+_session: Optional[requests.Session] = None
+_probe_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _build_session(max_retries: int = MAX_RETRIES) -> requests.Session:
+    """Create a keep-alive session with a sized pool and retry/backoff policy"""
+    # Only idempotent methods are retried (urllib3 default), so login and
+    # OTP POSTs are never sent twice. Retry-After is honoured on 429.
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUS_CODES,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(
+        {
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        }
+    )
+    return session
+
+
+def get_session(retry: bool = True) -> requests.Session:
+    """Return the process-wide pooled session, creating it on first use
+
+    With `retry=False` a separate session that never retries is returned,
+    for quick checks that must fail fast.
+    """
+    global _session, _probe_session
+    with _session_lock:
+        if retry and _session is None:
+            _session = _build_session()
+        if not retry and _probe_session is None:
+            _probe_session = _build_session(max_retries=0)
+    return _session if retry else _probe_session
+
+
+def auth_headers(token: Optional[str] = None) -> Dict[str, str]:
+    """Build request headers, adding the bearer token when given"""
+    headers = {"Accept": "application/json"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return headers
+
+
+def api_get(
+    path: str,
+    token: Optional[str] = None,
+    params: Optional[Dict] = None,
+    timeout: int = 30,
+    retry: bool = True,
+) -> requests.Response:
+    """GET an API path (e.g. "/records/") through the shared session"""
+    return get_session(retry).get(
+        f"{API_BASE_URL}{path}", headers=auth_headers(token), params=params, timeout=timeout
+    )
+
+
+def api_post(
+    path: str, json: Optional[Dict] = None, token: Optional[str] = None, timeout: int = 30
+) -> requests.Response:
+    """POST a JSON body to an API path through the shared session"""
+    headers = auth_headers(token)
+    headers["Content-Type"] = "application/json"
+    return get_session().post(
+        f"{API_BASE_URL}{path}", json=json, headers=headers, timeout=timeout
+    )
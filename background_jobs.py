@@ -0,0 +1,77 @@
+# Process-wide background jobs (one running instance per job name)
+import threading
+import time
+from asyncio.log import logger
+from typing import Any, Callable, Dict, Optional
+
+
+class BackgroundJob:
+    """A function running in a daemon thread, with status readable from any session
+
+    The target receives a `report(message)` callback as its first argument
+    to publish progress. Streamlit calls made inside the thread have no
+    script context and render nothing.
+    """
+
+    def __init__(self, name: str, target: Callable[..., Any], *args, **kwargs):
+        self.name = name
+        self.state = "pending"
+        self.message = ""
+        self.error: Optional[str] = None
+        self.result: Any = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._thread = threading.Thread(
+            target=self._run, args=(target, args, kwargs), name=f"job-{name}", daemon=True
+        )
+
+    @property
+    def running(self) -> bool:
+        return self.state in ("pending", "running")
+
+    def report(self, message: str):
+        """Publish a progress message"""
+        self.message = message
+        logger.info(f"[{self.name}] {message}")
+
+    def start(self):
+        self.started_at = time.time()
+        self.state = "running"
+        self._thread.start()
+
+    def _run(self, target, args, kwargs):
+        try:
+            self.result = target(self.report, *args, **kwargs)
+            self.state = "succeeded"
+        except Exception as e:
+            logger.error(f"Background job {self.name} failed: {e}")
+            self.error = str(e)
+            self.state = "failed"
+        finally:
+            self.finished_at = time.time()
+
+
+_jobs: Dict[str, BackgroundJob] = {}
+_jobs_lock = threading.Lock()
+
+
+def start_job(name: str, target: Callable[..., Any], *args, **kwargs) -> BackgroundJob:
+    """Start `target` in the background unless a job of that name is running
+
+    Returns the running job in either case, so concurrent callers share it.
+    """
+    with _jobs_lock:
+        job = _jobs.get(name)
+        if job is not None and job.running:
+            return job
+
+        job = BackgroundJob(name, target, *args, **kwargs)
+        _jobs[name] = job
+        job.start()
+        return job
+
+
+def get_job(name: str) -> Optional[BackgroundJob]:
+    """The current or last job of that name, if any"""
+    with _jobs_lock:
+        return _jobs.get(name)
@@ -0,0 +1,219 @@
+"""Benchmark the single-pass summary engine against the previous implementation.
+
+Also times filtered summaries answered from the rollup cube against
+re-scanning the frame for each filter combination.
+
+Run from the repository root:
+
+    python benchmarks/summarize_benchmark.py [--rows 1000000]
+
+Uses data/Records.csv (file_size is exposed as `size`, the field the
+summary reads) and a synthetic dataset of --rows records.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from categories import CATEGORIES, CATEGORY_ID_TO_NAME  # noqa: E402
+from records_frame import build_records_frame  # noqa: E402
+from summaries import (  # noqa: E402
+    RollupCube,
+    calculate_growth_rate,
+    calculate_storage_growth_rate,
+    summarize_frame,
+)
+
+# Filter combinations answered by the rollup cube
+FILTER_SETS = [
+    None,
+    {"categories": ["Food", "Images"]},
+    {"media_types": ["image"], "status": ["pending"]},
+    {"categories": ["Places"], "media_types": ["video", "audio"]},
+    {"date_range": (date(2025, 3, 1), date(2025, 5, 31))},
+    {"date_range": (date(2025, 7, 1), date(2025, 7, 14)), "media_types": ["text"]},
+]
+
+
+def legacy_summarize(records, filters=None):
+    """The per-media/per-category loop implementation being replaced"""
+    df = pd.DataFrame(records)
+    df["category"] = df["category_id"].map(CATEGORY_ID_TO_NAME).fillna("Unknown")
+    df["created_at"] = pd.to_datetime(df["created_at"], errors="coerce")
+    df["date"] = df["created_at"].dt.date
+    df["hour"] = df["created_at"].dt.hour
+    df["day_of_week"] = df["created_at"].dt.day_name()
+    df["month"] = df["created_at"].dt.month_name()
+    df["week"] = df["created_at"].dt.isocalendar().week
+
+    total_users = df["user_id"].nunique()
+    media_counts = df["media_type"].value_counts()
+    file_size_by_media_type = {}
+    avg_file_size_by_media_type = {}
+    file_size_by_category = {}
+    file_size_by_date = {}
+
+    df["size"] = pd.to_numeric(df["size"], errors="coerce").fillna(0)
+    total_file_size = df["size"].sum()
+    avg_file_size = total_file_size / len(df)
+    for media_type in df["media_type"].unique():
+        media_df = df[df["media_type"] == media_type]
+        file_size_by_media_type[media_type] = media_df["size"].sum()
+        avg_file_size_by_media_type[media_type] = media_df["size"].sum() / len(media_df)
+    for category in df["category"].unique():
+        file_size_by_category[category] = df[df["category"] == category]["size"].sum()
+    for day, group in df.groupby("date"):
+        file_size_by_date[day] = group["size"].sum()
+
+    return {
+        "total_records": len(df),
+        "total_users": total_users,
+        "unique_dates": df["date"].nunique(),
+        "date_range": (df["date"].min(), df["date"].max()),
+        "avg_daily_uploads": len(df) / max(df["date"].nunique(), 1),
+        "media_type": media_counts,
+        "status": df["status"].value_counts(),
+        "category": df["category"].value_counts(),
+        "uploads_per_day": df.groupby("date").size(),
+        "uploads_per_hour": df.groupby("hour").size(),
+        "uploads_per_weekday": df.groupby("day_of_week").size(),
+        "uploads_per_month": df.groupby("month").size(),
+        "uploads_per_week": df.groupby("week").size(),
+        "peak_upload_day": df.groupby("date").size().idxmax(),
+        "peak_upload_count": df.groupby("date").size().max(),
+        "most_active_hour": df.groupby("hour").size().idxmax(),
+        "most_active_weekday": df.groupby("day_of_week").size().idxmax(),
+        "category_diversity": len(df["category"].unique()),
+        "media_diversity": len(df["media_type"].unique()),
+        "weekly_growth": calculate_growth_rate(df.groupby("week").size()),
+        "monthly_growth": calculate_growth_rate(df.groupby("month").size()),
+        "total_file_size": total_file_size,
+        "avg_file_size": avg_file_size,
+        "file_size_by_media_type": file_size_by_media_type,
+        "avg_file_size_by_media_type": avg_file_size_by_media_type,
+        "file_size_by_category": file_size_by_category,
+        "file_size_by_date": file_size_by_date,
+        "storage_growth_weekly": calculate_storage_growth_rate(file_size_by_date, "weekly"),
+        "storage_growth_monthly": calculate_storage_growth_rate(file_size_by_date, "monthly"),
+    }
+
+
+def load_real_records():
+    df = pd.read_csv("data/Records.csv").rename(columns={"file_size": "size"})
+    return df.to_dict("records")
+
+
+def make_synthetic_records(rows, seed=7):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2025-01-01").value
+    span = pd.Timedelta(days=240).value
+    created = pd.to_datetime(start + rng.integers(0, span, rows))
+    df = pd.DataFrame(
+        {
+            "uid": np.arange(rows).astype(str),
+            "user_id": rng.integers(0, 5000, rows).astype(str),
+            "media_type": rng.choice(["image", "text", "video", "audio"], rows),
+            "status": rng.choice(["pending", "uploaded"], rows),
+            "category_id": rng.choice(list(CATEGORIES.values()), rows),
+            "size": rng.integers(0, 50_000_000, rows),
+            "created_at": created.strftime("%Y-%m-%dT%H:%M:%S.%f"),
+        }
+    )
+    return df.to_dict("records")
+
+
+# Not compared with the legacy summary: growth is now week over week and
+# month over month on the calendar (the legacy code compared the last two
+# ISO week numbers / month names present), and the time index is new
+CHANGED_KEYS = {"weekly_growth", "monthly_growth", "time_index"}
+
+
+def assert_same(old, new):
+    for key, expected in old.items():
+        if key in CHANGED_KEYS:
+            continue
+        actual = new[key]
+        if isinstance(expected, pd.Series):
+            pd.testing.assert_series_equal(
+                expected.sort_index(), actual.sort_index(),
+                check_names=False, check_index_type=False, check_dtype=False,
+            )
+        elif isinstance(expected, dict):
+            assert set(expected) == set(actual), key
+            for k in expected:
+                assert np.isclose(expected[k], actual[k]), (key, k)
+        elif isinstance(expected, tuple):
+            assert tuple(expected) == tuple(actual), key
+        elif isinstance(expected, (date, str)):
+            assert expected == actual, key
+        else:
+            assert np.isclose(expected, actual), (key, expected, actual)
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def run(label, records, repeat):
+    legacy_time, old = best_of(lambda: legacy_summarize(records), repeat)
+    new_time, new = best_of(lambda: summarize_frame(build_records_frame(records)), repeat)
+    assert_same(old, new)
+
+    # Aggregation alone, on a frame that has already been built once
+    df = build_records_frame(records)
+    agg_time, _ = best_of(lambda: summarize_frame(df), repeat)
+
+    print(f"{label} ({len(records):,} rows)")
+    print(f"  legacy (records -> summary)       {legacy_time:8.3f}s")
+    print(f"  single-pass (records -> summary)  {new_time:8.3f}s  {legacy_time / new_time:5.1f}x")
+    print(f"  single-pass (frame -> summary)    {agg_time:8.3f}s  {legacy_time / agg_time:5.1f}x")
+
+    scan_time, scanned = best_of(lambda: [summarize_frame(df, f) for f in FILTER_SETS], repeat)
+    build_time, cube = best_of(lambda: RollupCube(df), repeat)
+    cube_time, answered = best_of(lambda: [cube.summarize(f) for f in FILTER_SETS], repeat)
+    for expected, actual in zip(scanned, answered):
+        if expected is not None:
+            assert_same({k: v for k, v in expected.items() if k != "df"}, actual)
+            assert expected["weekly_growth"] == actual["weekly_growth"]
+
+    # Date range counts: prefix-sum lookups against masking the frame
+    days = pd.Series(df["date"].dropna().unique()).sort_values().to_numpy()
+    ranges = [tuple(sorted(pair)) for pair in np.random.default_rng(0).choice(days, (200, 2))]
+    time_index = new["time_index"]
+    mask_time, masked = best_of(
+        lambda: [int(((df["date"] >= a) & (df["date"] <= b)).sum()) for a, b in ranges], repeat
+    )
+    lookup_time, looked_up = best_of(lambda: [time_index.range_total(a, b) for a, b in ranges], repeat)
+    assert masked == looked_up
+
+    print(f"  {len(ranges)} date range counts, frame masks {mask_time:8.3f}s")
+    print(f"  {len(ranges)} date range counts, time index  {lookup_time:8.3f}s  {mask_time / lookup_time:5.1f}x")
+    print(f"  {len(FILTER_SETS)} filter sets, frame scans      {scan_time:8.3f}s")
+    print(f"  rollup cube build ({len(cube):,} cells)  {build_time:8.3f}s")
+    print(f"  {len(FILTER_SETS)} filter sets, from the cube    {cube_time:8.3f}s  {scan_time / cube_time:5.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if os.path.exists("data/Records.csv"):
+        run("data/Records.csv", load_real_records(), args.repeat)
+    run("synthetic", make_synthetic_records(args.rows), max(1, args.repeat - 2))
+
+
+if __name__ == "__main__":
+    main()
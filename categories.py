@@ -0,0 +1,20 @@
+# Corpus categories shared by the dashboards and data helpers
+CATEGORIES = {
+    "Fables": "379d6867-57c1-4f57-b6ee-fb734313e538",
+    "Events": "7a184c41-1a49-4beb-a01a-d8dc01693b15",
+    "Music": "94979e9f-4895-4cd7-8601-ad53d8099bf4",
+    "Places": "96e5104f-c786-4928-b932-f59f5b4ddbf0",
+    "Food": "833299f6-ff1c-4fde-804f-6d3b3877c76e",
+    "People": "af8b7a27-00b4-4192-9fa6-90152a0640b2",
+    "Literature": "74b133e7-e496-4e9d-85b0-3bd5eb4c3871",
+    "Architecture": "94a13c20-8a03-45da-8829-10e2fe1e61a1",
+    "Skills": "6f6f5023-a99e-4a29-a44a-6d5acbf88085",
+    "Images": "4366cab1-031e-4b37-816b-311ee34461a9",
+    "Culture": "ab9fa2ce-1f83-4e91-b89d-cca18e8b301e",
+    "Flora & Fauna": "5f40610f-ae47-4472-944c-cb899128ebbf",
+    "Education": "784ddb92-9540-4ce1-b4e4-6c1b7b18849d",
+    "Vegetation": "2f831ae2-f0cd-4142-8646-68dd195dfba2",
+    "Dance": "3fa85f64-5717-4562-b3fc-2c963f66afa6",
+}
+
+CATEGORY_ID_TO_NAME = {v: k for k, v in CATEGORIES.items()}
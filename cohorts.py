@@ -0,0 +1,155 @@
+# Student cohorts: every CSV in data/clgdetails mapped to one student table
+import glob
+import os
+from asyncio.log import logger
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+import pandas as pd
+
+from shared_cache import SharedCache
+from snapshot_store import load_csv_snapshot, source_signature
+
+COHORT_DIR = "data/clgdetails"
+COHORT_LOAD_CONCURRENCY = 4
+
+# Common student schema (the Cohort1.csv headers) and the aliases other cohorts use
+NAME_COLUMN = 'Full Name'
+PHONE_COLUMN = 'Contact Number'
+COLLEGE_COLUMN = 'Affiliation (College/Company/Organization Name)'
+EMAIL_COLUMN = 'Email Address'
+CREATED_COLUMN = 'CreatedAt'
+STUDENT_COLUMNS = [NAME_COLUMN, CREATED_COLUMN, PHONE_COLUMN, COLLEGE_COLUMN, EMAIL_COLUMN]
+
+COLUMN_ALIASES = {
+    NAME_COLUMN: ['FirstName', 'Name', 'Student Name'],
+    PHONE_COLUMN: ['Phone Number', 'Phone', 'Phone no', 'Mobile', 'Mobile Number'],
+    COLLEGE_COLUMN: ['College', 'College Name', 'Affiliation', 'Organization'],
+    EMAIL_COLUMN: ['Email', 'Email ID'],
+    CREATED_COLUMN: ['Created At', 'Timestamp'],
+}
+
+# Combined student tables, keyed by the signatures of the cohort files
+_students_cache = SharedCache(max_entries=4, ttl=3600)
+
+
+def clean_phone_number(phone):
+    """Clean and normalize phone numbers for matching"""
+    if pd.isna(phone) or phone == 'nan' or str(phone).strip() == '':
+        return None
+
+    phone_str = str(phone).strip()
+    # Remove country code, spaces, dashes, parentheses
+    phone_clean = phone_str.replace("+91", "").replace("-", "").replace(" ", "").replace("(", "").replace(")", "")
+    phone_clean = phone_clean.lstrip("0")
+
+    if phone_clean.isdigit() and len(phone_clean) == 10:
+        return phone_clean
+    return None
+
+
+def clean_phone_numbers(phones: pd.Series) -> pd.Series:
+    """Vectorized `clean_phone_number`: 10-digit numbers, None where invalid"""
+    text = phones.astype(str).str.strip()
+    cleaned = text
+    for token in ("+91", "-", " ", "(", ")"):
+        cleaned = cleaned.str.replace(token, "", regex=False)
+    cleaned = cleaned.str.lstrip("0")
+
+    valid = (
+        phones.notna()
+        & (phones.astype(str) != 'nan')
+        & (text != '')
+        & cleaned.str.isdigit()
+        & (cleaned.str.len() == 10)
+    )
+    return cleaned.where(valid, None)
+
+
+def discover_cohort_files(cohort_dir: str = COHORT_DIR) -> List[str]:
+    """All cohort CSVs, in name order (earlier files win on duplicate phones)"""
+    return sorted(glob.glob(os.path.join(cohort_dir, "*.csv")))
+
+
+def cohort_name(path: str) -> str:
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def cohort_signature(paths: Optional[List[str]] = None) -> List[dict]:
+    """Signatures of the cohort files; changes when any file is added or edited"""
+    paths = discover_cohort_files() if paths is None else paths
+    return [source_signature(path) for path in paths]
+
+
+def normalize_cohort(df: pd.DataFrame, name: str) -> pd.DataFrame:
+    """Rename a cohort's columns to the common schema
+
+    Missing optional columns are left empty; a cohort without a college
+    column is attributed to a college named after the cohort file.
+    """
+    renames = {}
+    for column, aliases in COLUMN_ALIASES.items():
+        if column in df.columns:
+            continue
+        for alias in aliases:
+            if alias in df.columns:
+                renames[alias] = column
+                break
+    df = df.rename(columns=renames)
+
+    for column in (NAME_COLUMN, PHONE_COLUMN):
+        if column not in df.columns:
+            raise ValueError(f"Cohort {name} has no '{column}' column")
+    if pd.api.types.is_float_dtype(df[PHONE_COLUMN]):
+        # Blank cells make pandas read phone numbers as floats ("9000000003.0")
+        df[PHONE_COLUMN] = df[PHONE_COLUMN].map(lambda v: None if pd.isna(v) else str(int(v)))
+    if COLLEGE_COLUMN not in df.columns:
+        df[COLLEGE_COLUMN] = name
+    for column in (EMAIL_COLUMN, CREATED_COLUMN):
+        if column not in df.columns:
+            df[column] = None
+
+    df = df[STUDENT_COLUMNS].copy()
+    df['Cohort'] = name
+    return df
+
+
+def load_cohort(path: str) -> pd.DataFrame:
+    """One cohort file in the common schema (read through its snapshot)"""
+    return normalize_cohort(load_csv_snapshot(path), cohort_name(path))
+
+
+def _load_students(paths: Tuple[str, ...]) -> pd.DataFrame:
+    with ThreadPoolExecutor(max_workers=COHORT_LOAD_CONCURRENCY) as executor:
+        cohorts = list(executor.map(load_cohort, paths))
+
+    students = pd.concat(cohorts, ignore_index=True)
+    students['clean_phone'] = clean_phone_numbers(students[PHONE_COLUMN])
+
+    # One row per valid phone number; rows without one cannot be matched anyway
+    duplicate = students['clean_phone'].notna() & students['clean_phone'].duplicated()
+    students = students[~duplicate].set_index('clean_phone', drop=False)
+    students.index.name = 'phone'
+
+    logger.info(
+        f"Loaded {len(students)} students from {len(paths)} cohorts "
+        f"({int(duplicate.sum())} duplicate phones dropped)"
+    )
+    return students
+
+
+def load_students(paths: Optional[List[str]] = None) -> pd.DataFrame:
+    """All cohorts as one deduplicated student table, indexed by cleaned phone
+
+    The index holds each student's `clean_phone` and is unique over valid
+    phones; students without a valid phone keep a missing (NaN) label, so
+    they still count towards their college but never match a user.
+    Files are loaded in parallel; the combined table is cached per set of
+    file versions, so requests only re-read cohorts after a file changes.
+    """
+    paths = discover_cohort_files() if paths is None else paths
+    if not paths:
+        raise FileNotFoundError(f"No cohort files found in {COHORT_DIR}")
+
+    key = tuple(tuple(sorted(sig.items())) for sig in cohort_signature(paths))
+    return _students_cache.get_or_load(key, lambda: _load_students(tuple(paths)))
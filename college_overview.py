@@ -1,187 +1,403 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode, DataReturnMode
 import plotly.express as px
 import os
+import copy
 import logging
-from user import fetch_all_users, fetch_all_records
+from datetime import datetime
+from user import fetch_all_users_with_cache
+from snapshot_store import (
+    load_csv_snapshot, load_snapshot_with_meta, replace_atomically, save_snapshot, source_signature,
+)
+from shared_cache import SharedCache
+from contributions_store import load_contribution_state, save_contribution_state
+from background_jobs import get_job, start_job
+from cohorts import (
+    COLLEGE_COLUMN, EMAIL_COLUMN, CREATED_COLUMN, NAME_COLUMN, PHONE_COLUMN,
+    clean_phone_numbers, cohort_signature, discover_cohort_files,
+    load_students,
+)
 
 logger = logging.getLogger(__name__)
 
-def clean_phone_number(phone):
-    """Clean and normalize phone numbers for matching"""
-    if pd.isna(phone) or phone == 'nan' or str(phone).strip() == '':
-        return None
-    
-    phone_str = str(phone).strip()
-    # Remove country code, spaces, dashes, parentheses
-    phone_clean = phone_str.replace("+91", "").replace("-", "").replace(" ", "").replace("(", "").replace(")", "")
-    phone_clean = phone_clean.lstrip("0")
-    
-    if phone_clean.isdigit() and len(phone_clean) == 10:
-        return phone_clean
-    return None
+RECORDS_PATH = "data/Records.csv"
+CONTRIBUTIONS_PATH = "data/contributions_data.csv"
+CONTRIBUTIONS_JOB = "contributions_data"
+COLLEGE_SUMMARY_SNAPSHOT = "college_summary"
 
-def generate_contribution_data(token):
-    """Generate contribution_data.csv following the exact specified flow"""
-    
-    # Step 1: Fetch all users
-    st.info("Step 1: Fetching all users...")
-    try:
-        users_data = fetch_all_users(token)
-        if not users_data:
-            st.error("Failed to fetch users data")
-            return None
-        
-        df_users = pd.DataFrame(users_data)
-        st.success(f"✅ Fetched {len(df_users)} users")
-    except Exception as e:
-        st.error(f"Error fetching users: {e}")
-        return None
-    
-    # Step 2: Read clgdetails.csv
-    st.info("Step 2: Reading college details...")
-    clgdetails_path = "data/clgdetails/Cohort1.csv"
-    
-    if not os.path.exists(clgdetails_path):
-        st.error(f"College details file not found: {clgdetails_path}")
-        return None
-    
+# Media types counted per user, and the column layout of contributions_data.csv
+MEDIA_TYPES = ['image', 'video', 'audio', 'text']
+CONTRIBUTION_COLUMNS = ['Name', 'Phone no', 'Registration status', 'user id',
+                        'total contributions', 'image', 'audio', 'video', 'text',
+                        'College', 'Email', 'CreatedAt']
+
+# Student detail columns shown in AG Grid 2, and the rows sent to the browser at once
+STUDENT_DETAIL_COLUMNS = {
+    'Name': 'Name',
+    'Registration status': 'Status of App Registration (Y/N)',
+    'total contributions': 'Total No of Contributions',
+    'image': 'Image',
+    'video': 'Video',
+    'audio': 'Audio',
+    'text': 'Text',
+}
+STUDENT_PAGE_SIZE = 1000
+
+# College summary table and grid options, keyed by the contributions file version
+_college_views = SharedCache(max_entries=4, ttl=3600)
+
+
+def build_user_lookup(df_users: pd.DataFrame) -> pd.Series:
+    """clean phone -> user id; when phones collide the last user wins"""
+    if 'id' in df_users.columns:
+        user_ids = df_users['id']
+    elif 'user_id' in df_users.columns:
+        user_ids = df_users['user_id']
+    else:
+        user_ids = pd.Series('N/A', index=df_users.index)
+
+    lookup = pd.Series(user_ids.values, index=clean_phone_numbers(df_users['phone']).values)
+    lookup = lookup[lookup.index.notna()]
+    return lookup[~lookup.index.duplicated(keep='last')]
+
+
+def map_students(df_clg: pd.DataFrame, user_lookup: pd.Series) -> pd.DataFrame:
+    """Join students to users on the cleaned phone number (hash lookup)"""
+    if 'clean_phone' in df_clg.columns:
+        clean_phone = df_clg['clean_phone']
+    else:
+        clean_phone = clean_phone_numbers(df_clg[PHONE_COLUMN])
+    registered = clean_phone.isin(user_lookup.index)
+
+    def optional(column):
+        return df_clg[column] if column in df_clg.columns else ''
+
+    mapped = pd.DataFrame({
+        'Name': df_clg[NAME_COLUMN],
+        'Phone no': df_clg[PHONE_COLUMN],
+        'Registration status': registered.map({True: 'Y', False: 'N'}),
+        'user id': clean_phone.map(user_lookup).where(registered, 'N/A'),
+        'College': df_clg[COLLEGE_COLUMN],
+        'Email': optional(EMAIL_COLUMN),
+        'CreatedAt': optional(CREATED_COLUMN),
+    })
+    # Positional rows, whatever the student table is indexed by
+    return mapped.reset_index(drop=True)
+
+
+def count_contributions(df_records: pd.DataFrame) -> pd.DataFrame:
+    """Per-user totals (non-empty titles) and a user_id x media_type crosstab"""
+    media_type = df_records['media_type'].astype(object).str.lower()
+    totals = df_records.groupby('user_id')['title'].count()
+
+    media_counts = pd.crosstab(df_records['user_id'], media_type)
+    media_counts = media_counts.reindex(index=totals.index, columns=MEDIA_TYPES, fill_value=0)
+
+    contributions = media_counts.astype(int)
+    contributions.insert(0, 'total contributions', totals.astype(int))
+    contributions.columns.name = None
+    return contributions
+
+
+def attach_contributions(df_mapped: pd.DataFrame, contributions: pd.DataFrame) -> pd.DataFrame:
+    """Fill the count columns of mapped students from per-user contributions"""
+    for column in ['total contributions'] + MEDIA_TYPES:
+        df_mapped[column] = df_mapped['user id'].map(contributions[column]).fillna(0).astype(int)
+    return df_mapped[CONTRIBUTION_COLUMNS]
+
+
+def build_contribution_data(
+    df_users: pd.DataFrame, df_clg: pd.DataFrame, df_records: pd.DataFrame
+) -> pd.DataFrame:
+    """Students joined with their registration and contribution counts"""
+    df_mapped = map_students(df_clg, build_user_lookup(df_users))
+    return attach_contributions(df_mapped, count_contributions(df_records))
+
+
+def changed_keys(old: pd.Series, new: pd.Series) -> set:
+    """Index labels added, removed or mapped to a different value"""
+    old, new = old.astype(object).align(new.astype(object), join='outer')
+    differs = (old != new) & ~(old.isna() & new.isna())
+    return set(differs.index[differs.values])
+
+
+def changed_contributors(old: pd.DataFrame, new: pd.DataFrame) -> set:
+    """User ids whose contribution counts differ between two count tables"""
+    old, new = old.align(new, join='outer', fill_value=-1)
+    differs = (old != new).any(axis=1)
+    return set(differs.index[differs.values])
+
+
+def update_contribution_data(
+    state: dict, user_lookup: pd.Series, contributions: pd.DataFrame
+):
+    """Re-map only the students touched by changed users or counts
+
+    Returns the updated frame and the affected rows as a boolean mask.
+    """
+    df = state['frame']
+    phones = clean_phone_numbers(df['Phone no'])
+
+    changed_phones = changed_keys(state['user_lookup'], user_lookup)
+    changed_users = changed_contributors(state['contributions'], contributions)
+
+    affected = phones.isin(changed_phones) | df['user id'].isin(changed_users)
+    if not affected.any():
+        return df, affected
+
+    rows = df.loc[affected].copy()
+    registered = phones[affected].isin(user_lookup.index)
+    rows['Registration status'] = registered.map({True: 'Y', False: 'N'})
+    rows['user id'] = phones[affected].map(user_lookup).where(registered, 'N/A')
+    rows = attach_contributions(rows, contributions)
+
+    df = df.copy()
+    for column in ['Registration status', 'user id', 'total contributions'] + MEDIA_TYPES:
+        df.loc[affected, column] = rows[column]
+    return df, affected
+
+
+def build_sources() -> dict:
+    """Signatures of the input files a build is made from"""
+    return {
+        'students': cohort_signature(),
+        'records': source_signature(RECORDS_PATH),
+    }
+
+
+def write_contribution_data(
+    df_final: pd.DataFrame, user_lookup: pd.Series, contributions: pd.DataFrame
+):
+    """Atomically replace contributions_data.csv and remember its inputs
+
+    The new file is written to a unique temp file next to the old one and
+    swapped in with `os.replace`, so readers always see a complete file
+    and concurrent builds never share a temp file.
+    """
+    os.makedirs(os.path.dirname(CONTRIBUTIONS_PATH), exist_ok=True)
+    replace_atomically(CONTRIBUTIONS_PATH, lambda tmp_path: df_final.to_csv(tmp_path, index=False))
+    save_contribution_state(df_final, user_lookup, contributions, build_sources())
+    save_college_summary(df_final)
+
+
+def summarize_colleges(df_final: pd.DataFrame) -> pd.DataFrame:
+    """Per-college students, registrations and contributions by media type"""
+    df = df_final.assign(registered=(df_final['Registration status'] == 'Y').astype(int))
+    college_stats = df.groupby('College', observed=True).agg(**{
+        'No of Students': ('Name', 'count'),
+        'No of Registered Users': ('registered', 'sum'),
+        'Total Contributions': ('total contributions', 'sum'),
+        'Image': ('image', 'sum'),
+        'Video': ('video', 'sum'),
+        'Audio': ('audio', 'sum'),
+        'Text': ('text', 'sum'),
+    })
+    college_stats.insert(
+        2, 'No of Unregistered Users',
+        college_stats['No of Students'] - college_stats['No of Registered Users'],
+    )
+    college_stats = college_stats.reset_index()
+    college_stats['College'] = college_stats['College'].astype(str)
+    return college_stats.rename(columns={'College': 'Total Colleges'})
+
+
+def save_college_summary(df_final: pd.DataFrame) -> pd.DataFrame:
+    """Materialize the college summary for the current contributions file"""
+    college_stats = summarize_colleges(df_final)
     try:
-        df_clg = pd.read_csv(clgdetails_path)
-        st.success(f"✅ Loaded {len(df_clg)} college records")
+        save_snapshot(
+            COLLEGE_SUMMARY_SNAPSHOT, college_stats,
+            meta={'source': source_signature(CONTRIBUTIONS_PATH)},
+        )
     except Exception as e:
-        st.error(f"Error reading college details: {e}")
-        return None
-    
-    # Step 3: Map students with users based on phone number
-    st.info("Step 3: Mapping students with users based on phone numbers...")
-    
-    # Clean phone numbers in both dataframes
-    df_users['clean_phone'] = df_users['phone'].apply(clean_phone_number)
-    df_clg['clean_phone'] = df_clg['Contact Number'].apply(clean_phone_number)
-    
-    # Create user lookup dictionary
-    user_lookup = {}
-    for _, user in df_users.iterrows():
-        clean_phone = user['clean_phone']
-        if clean_phone:
-            user_lookup[clean_phone] = {
-                'user_id': user.get('id', user.get('user_id', 'N/A')),
-                'registered': 'Y'
-            }
-    
-    # Map students with users
-    mapped_students = []
-    for _, student in df_clg.iterrows():
-        clean_phone = student['clean_phone']
-        original_phone = student['Contact Number']
+        logger.warning(f"Could not save college summary: {e}")
+    return college_stats
+
+
+def load_college_summary() -> pd.DataFrame:
+    """The persisted college summary, rebuilt only if the contributions file changed"""
+    stored = load_snapshot_with_meta(COLLEGE_SUMMARY_SNAPSHOT)
+    if stored is not None and stored[0].get('source') == source_signature(CONTRIBUTIONS_PATH):
+        return stored[1]
+    return save_college_summary(load_csv_snapshot(CONTRIBUTIONS_PATH))
+
+
+def college_summary_view():
+    """(college summary, AG Grid options) for the current data version"""
+    signature = source_signature(CONTRIBUTIONS_PATH)
+    key = ('college_summary', signature['path'], signature['size'], signature['mtime_ns'])
+
+    def build():
+        college_stats = load_college_summary()
         
-        if clean_phone and clean_phone in user_lookup:
-            # Student is registered
-            user_info = user_lookup[clean_phone]
-            mapped_students.append({
-                'Name': student['Full Name'],
-                'Phone no': original_phone,
-                'Registration status': 'Y',
-                'user id': user_info['user_id'],
-                'College': student['Affiliation (College/Company/Organization Name)'],
-                'Email': student.get('Email Address', ''),
-                'CreatedAt': student.get('CreatedAt', '')
-            })
-        else:
-            # Student is not registered
-            mapped_students.append({
-                'Name': student['Full Name'],
-                'Phone no': original_phone,
-                'Registration status': 'N',
-                'user id': 'N/A',
-                'College': student['Affiliation (College/Company/Organization Name)'],
-                'Email': student.get('Email Address', ''),
-                'CreatedAt': student.get('CreatedAt', '')
-            })
-    
-    df_mapped = pd.DataFrame(mapped_students)
-    st.success(f"✅ Mapped {len(df_mapped)} students")
-    
-    # Step 4: Read Records.csv and map contributions
-    st.info("Step 4: Reading records and mapping contributions...")
-    records_path = "data/Records.csv"
-    
-    if not os.path.exists(records_path):
-        st.error(f"Records file not found: {records_path}")
-        return None
-    
-    try:
-        df_records = pd.read_csv(records_path)
-        st.success(f"✅ Loaded {len(df_records)} records")
-    except Exception as e:
-        st.error(f"Error reading records: {e}")
-        return None
-    
-    # Calculate contributions by user_id
-    df_records['media_type'] = df_records['media_type'].str.lower()
-    
-    # Group by user_id and count contributions by media type
-    contributions = df_records.groupby('user_id').agg({
-        'title': 'count',  # total contributions
-        'media_type': list
-    }).rename(columns={'title': 'total_contributions'})
-    
-    # Count each media type
-    def count_media_types(media_list):
-        counts = {'image': 0, 'video': 0, 'audio': 0, 'text': 0}
-        for media in media_list:
-            if media in counts:
-                counts[media] += 1
-        return counts
-    
-    # Apply media type counting
-    contribution_details = []
-    for user_id, row in contributions.iterrows():
-        media_counts = count_media_types(row['media_type'])
-        contribution_details.append({
-            'user_id': user_id,
-            'total contributions': row['total_contributions'],
-            'image': media_counts['image'],
-            'video': media_counts['video'],
-            'audio': media_counts['audio'],
-            'text': media_counts['text']
-        })
-    
-    df_contributions = pd.DataFrame(contribution_details)
+        gb1 = GridOptionsBuilder.from_dataframe(college_stats)
+        gb1.configure_pagination(paginationAutoPageSize=True)
+        gb1.configure_side_bar()
+        gb1.configure_default_column(sortable=True, filter=True, resizable=True)
+        gb1.configure_selection(selection_mode="single", use_checkbox=False)
+        return college_stats, gb1.build()
+
+    return _college_views.get_or_load(key, build)
+
+
+def college_row_ranges(colleges: pd.Series) -> dict:
+    """college -> (start, stop) row range over a college-sorted column"""
+    values = colleges.astype(object).to_numpy()
+    if len(values) == 0:
+        return {}
+    
+    boundaries = np.flatnonzero(values[1:] != values[:-1]) + 1
+    starts = np.r_[0, boundaries]
+    stops = np.r_[boundaries, len(values)]
+    return {
+        values[start]: (int(start), int(stop))
+        for start, stop in zip(starts, stops)
+        if pd.notna(values[start])
+    }
+
+
+def student_details_view():
+    """(student details sorted by college, college row ranges, AG Grid options)
+
+    Built once per data version; a college's students are then the
+    contiguous slice `details.iloc[start:stop]`.
+    """
+    signature = source_signature(CONTRIBUTIONS_PATH)
+    key = ('student_details', signature['path'], signature['size'], signature['mtime_ns'])
+
+    def build():
+        df_final = load_csv_snapshot(CONTRIBUTIONS_PATH)
+        df_sorted = df_final.sort_values('College', kind='stable', na_position='last')
+        ranges = college_row_ranges(df_sorted['College'])
+        
+        details = df_sorted[list(STUDENT_DETAIL_COLUMNS)].rename(columns=STUDENT_DETAIL_COLUMNS)
+        details = details.reset_index(drop=True)
+        
+        # Configure AG Grid for student details
+        gb2 = GridOptionsBuilder.from_dataframe(details)
+        gb2.configure_pagination(paginationAutoPageSize=True)
+        gb2.configure_side_bar()
+        gb2.configure_default_column(sortable=True, filter=True, resizable=True)
+        
+        # Configure specific columns
+        gb2.configure_column("Name", pinned="left", width=200)
+        gb2.configure_column("Total No of Contributions", type=["numericColumn"], width=180)
+        gb2.configure_column("Image", type=["numericColumn"], width=100)
+        gb2.configure_column("Video", type=["numericColumn"], width=100)
+        gb2.configure_column("Audio", type=["numericColumn"], width=100)
+        gb2.configure_column("Text", type=["numericColumn"], width=100)
+        return details, ranges, gb2.build()
+
+    return _college_views.get_or_load(key, build)
+
+
+def fetch_user_lookup(token):
+    """Fetch all users (shared cache) and index them by clean phone number"""
+    users_data = fetch_all_users_with_cache(token)
+    if not users_data:
+        raise ValueError("Failed to fetch users data")
+    return build_user_lookup(pd.DataFrame(users_data))
+
+
+def read_records_contributions():
+    """Per-user contribution counts from Records.csv"""
+    if not os.path.exists(RECORDS_PATH):
+        raise FileNotFoundError(f"Records file not found: {RECORDS_PATH}")
+    df_records = load_csv_snapshot(RECORDS_PATH, columns=['user_id', 'title', 'media_type'])
+    return count_contributions(df_records)
+
+
+def generate_contribution_data(token, report=logger.info):
+    """Generate contribution_data.csv following the exact specified flow
+
+    `report` receives a message per step. Errors are raised, not shown, so
+    this can run outside the Streamlit script thread.
+    """
+    # Step 1: Fetch all users
+    report("Step 1: Fetching all users...")
+    user_lookup = fetch_user_lookup(token)
     
-    # Step 5: Final mapping - merge students with their contributions
-    st.info("Step 5: Creating final contribution data...")
+    # Step 2: Read every cohort in data/clgdetails
+    report("Step 2: Reading college details...")
+    df_clg = load_students()
     
-    # Merge mapped students with contributions
-    df_final = df_mapped.merge(
-        df_contributions,
-        left_on='user id',
-        right_on='user_id',
-        how='left'
-    )
+    # Step 3: Read Records.csv
+    report("Step 3: Reading records...")
+    contributions = read_records_contributions()
     
-    # Fill missing contribution data with zeros
-    contribution_columns = ['total contributions', 'image', 'video', 'audio', 'text']
-    for col in contribution_columns:
-        df_final[col] = df_final[col].fillna(0).astype(int)
+    # Step 4: Map students to users by phone and join their contribution counts
+    report("Step 4: Mapping students and contributions...")
+    df_final = attach_contributions(map_students(df_clg, user_lookup), contributions)
     
-    # Select and reorder final columns as specified
-    final_columns = ['Name', 'Phone no', 'Registration status', 'user id', 
-                    'total contributions', 'image', 'audio', 'video', 'text', 
-                    'College', 'Email', 'CreatedAt']
+    # Save to contribution_data.csv
+    write_contribution_data(df_final, user_lookup, contributions)
     
-    df_final = df_final[final_columns]
+    report(f"Generated contribution_data.csv with {len(df_final)} records")
+    return df_final
+
+
+def refresh_contribution_data(token, report=logger.info):
+    """Bring contribution_data.csv up to date, re-mapping only changed students
+
+    Users are compared by phone -> user id, records by per-user counts (and
+    Records.csv is only re-read if it changed). Without a previous build, or
+    when the student list changed, this falls back to a full rebuild.
+    """
+    state = load_contribution_state()
+    sources = state['sources'] if state else {}
+    if (
+        state is None
+        or not os.path.exists(CONTRIBUTIONS_PATH)
+        or not discover_cohort_files()
+        or sources.get('students') != cohort_signature()
+    ):
+        report("No reusable previous build, regenerating from scratch...")
+        return generate_contribution_data(token, report)
+    
+    report("Fetching users...")
+    user_lookup = fetch_user_lookup(token)
+    
+    records_changed = sources.get('records') != source_signature(RECORDS_PATH)
+    if records_changed:
+        report("Reading changed records...")
+        contributions = read_records_contributions()
+    else:
+        contributions = state['contributions']
     
-    # Save to contribution_data.csv
-    output_path = "data/contributions_data.csv"
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    df_final.to_csv(output_path, index=False)
+    report("Updating changed students...")
+    df_final, affected = update_contribution_data(state, user_lookup, contributions)
+    if affected.any() or records_changed:
+        write_contribution_data(df_final, user_lookup, contributions)
     
-    st.success(f"✅ Generated contribution_data.csv with {len(df_final)} records")
+    colleges = df_final.loc[affected, 'College'].nunique()
+    report(f"Refreshed contribution data: {int(affected.sum())} students updated across {colleges} colleges")
     return df_final
 
+
+def start_contribution_rebuild(token, incremental: bool = True):
+    """Rebuild contributions_data.csv in the background (one job at a time)"""
+    build = refresh_contribution_data if incremental else generate_contribution_data
+    return start_job(CONTRIBUTIONS_JOB, lambda report: build(token, report))
+
+
+def show_rebuild_status():
+    """Show the state of the current or last contributions rebuild"""
+    job = get_job(CONTRIBUTIONS_JOB)
+    if job is None:
+        return
+    
+    started = datetime.fromtimestamp(job.started_at).strftime('%H:%M:%S')
+    if job.running:
+        st.info(f"⏳ Rebuilding contributions data in the background (started {started}): {job.message}")
+    elif job.state == "failed":
+        st.error(f"❌ Contributions rebuild started {started} failed: {job.error}")
+    else:
+        finished = datetime.fromtimestamp(job.finished_at).strftime('%H:%M:%S')
+        st.success(f"✅ Contributions data rebuilt at {finished}. {job.message}")
+
+
 def display_college_overview(fetch_all_users, fetch_user_contributions_param, token: str):
     st.title("🏫 College Overview Dashboard")
     
@@ -189,20 +405,27 @@ def display_college_overview(fetch_all_users, fetch_user_contributions_param, to
         st.warning("🔐 You must be logged in to access this section.")
         return
     
-    contributions_data_path = "data/contributions_data.csv"
+    contributions_data_path = CONTRIBUTIONS_PATH
     
     # Check if contributions_data.csv exists
     if not os.path.exists(contributions_data_path):
-        st.info("🔄 Contributions data not found. Generating from scratch...")
-        
-        with st.spinner("Generating contribution data..."):
-            df_final = generate_contribution_data(token)
-            if df_final is None:
-                return
+        # Build it in the background; this page stays responsive meanwhile
+        job = get_job(CONTRIBUTIONS_JOB)
+        if job is None or job.state != "failed":
+            start_contribution_rebuild(token, incremental=False)
+        show_rebuild_status()
+        if job is not None and job.state == "failed":
+            if st.button("🔁 Retry"):
+                start_contribution_rebuild(token, incremental=False)
+                st.rerun()
+        elif st.button("🔄 Check Status"):
+            st.rerun()
+        return
     else:
-        st.info("📊 Loading existing contributions data...")
+        show_rebuild_status()
         try:
-            df_final = pd.read_csv(contributions_data_path)
+            # Materialized per data version: reruns and selections never re-aggregate
+            college_stats, grid_options1 = college_summary_view()
         except Exception as e:
             st.error(f"Error loading contributions data: {e}")
             return
@@ -210,32 +433,10 @@ def display_college_overview(fetch_all_users, fetch_user_contributions_param, to
     # AG Grid 1: College-wise Summary
     st.markdown("### 📊 AG Grid 1: College-wise Summary")
     
-    # Calculate college-wise statistics
-    college_stats = df_final.groupby('College').agg({
-        'Name': 'count',  # Total students
-        'Registration status': lambda x: (x == 'Y').sum()  # Registered users
-    }).rename(columns={
-        'Name': 'No of Students',
-        'Registration status': 'No of Registered Users'
-    })
-    
-    college_stats['No of Unregistered Users'] = college_stats['No of Students'] - college_stats['No of Registered Users']
-    college_stats = college_stats.reset_index()
-    college_stats.rename(columns={'College': 'Total Colleges'}, inplace=True)
-    
-    # Configure AG Grid for college summary
-    gb1 = GridOptionsBuilder.from_dataframe(college_stats)
-    gb1.configure_pagination(paginationAutoPageSize=True)
-    gb1.configure_side_bar()
-    gb1.configure_default_column(sortable=True, filter=True, resizable=True)
-    gb1.configure_selection(selection_mode="single", use_checkbox=False)
-    
-    grid_options1 = gb1.build()
-    
     # Display AG Grid 1
     grid_response1 = AgGrid(
         college_stats,
-        gridOptions=grid_options1,
+        gridOptions=copy.deepcopy(grid_options1),
         data_return_mode=DataReturnMode.FILTERED_AND_SORTED,
         update_mode=GridUpdateMode.SELECTION_CHANGED,
         fit_columns_on_grid_load=True,
@@ -259,44 +460,34 @@ def display_college_overview(fetch_all_users, fetch_user_contributions_param, to
         st.info("👆 Please select a college from the table above to view student details")
         return
     
-    # Filter data for selected college
-    filtered_df = df_final[df_final['College'] == selected_college].copy()
-    
-    # Prepare data for AG Grid 2
-    student_details = filtered_df[[
-        'Name', 'Registration status', 'total contributions', 
-        'image', 'video', 'audio', 'text'
-    ]].copy()
-    
-    student_details.rename(columns={
-        'Registration status': 'Status of App Registration (Y/N)',
-        'total contributions': 'Total No of Contributions',
-        'image': 'Image',
-        'video': 'Video',
-        'audio': 'Audio',
-        'text': 'Text'
-    }, inplace=True)
-    
-    # Configure AG Grid for student details
-    gb2 = GridOptionsBuilder.from_dataframe(student_details)
-    gb2.configure_pagination(paginationAutoPageSize=True)
-    gb2.configure_side_bar()
-    gb2.configure_default_column(sortable=True, filter=True, resizable=True)
-    
-    # Configure specific columns
-    gb2.configure_column("Name", pinned="left", width=200)
-    gb2.configure_column("Total No of Contributions", type=["numericColumn"], width=180)
-    gb2.configure_column("Image", type=["numericColumn"], width=100)
-    gb2.configure_column("Video", type=["numericColumn"], width=100)
-    gb2.configure_column("Audio", type=["numericColumn"], width=100)
-    gb2.configure_column("Text", type=["numericColumn"], width=100)
+    try:
+        details, college_ranges, grid_options2 = student_details_view()
+    except Exception as e:
+        st.error(f"Error loading contributions data: {e}")
+        return
     
-    grid_options2 = gb2.build()
+    # Slice the selected college's rows out of the college-sorted table (no scan, no copy)
+    start, stop = college_ranges.get(selected_college, (0, 0))
+    student_details = details.iloc[start:stop]
+    
+    # Large colleges are paged on the server so only one page goes to the browser
+    page_rows = student_details
+    if len(student_details) > STUDENT_PAGE_SIZE:
+        page_count = -(-len(student_details) // STUDENT_PAGE_SIZE)
+        page = st.number_input(
+            f"Page (of {page_count})", min_value=1, max_value=page_count, value=1, step=1,
+            key=f"college_students_page_{selected_college}",
+        )
+        first = (int(page) - 1) * STUDENT_PAGE_SIZE
+        page_rows = student_details.iloc[first:first + STUDENT_PAGE_SIZE]
+        st.caption(
+            f"Showing students {first + 1:,}–{first + len(page_rows):,} of {len(student_details):,}"
+        )
     
     # Display AG Grid 2
     grid_response2 = AgGrid(
-        student_details,
-        gridOptions=grid_options2,
+        page_rows,
+        gridOptions=copy.deepcopy(grid_options2),
         data_return_mode=DataReturnMode.FILTERED_AND_SORTED,
         update_mode=GridUpdateMode.MODEL_CHANGED,
         fit_columns_on_grid_load=True,
@@ -319,8 +510,11 @@ def display_college_overview(fetch_all_users, fetch_user_contributions_param, to
         )
     
     with col2:
+        # Rebuilds run in the background; the current file stays in use until swapped
+        if st.button("♻️ Refresh Contributions Data"):
+            start_contribution_rebuild(token, incremental=True)
+            st.rerun()
+        
         if st.button("🔄 Regenerate Contributions Data"):
-            if os.path.exists(contributions_data_path):
-                os.remove(contributions_data_path)
-                st.success("Contributions data cleared. Please refresh the page to regenerate.")
-                st.experimental_rerun()
+            start_contribution_rebuild(token, incremental=False)
+            st.rerun()
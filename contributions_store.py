@@ -0,0 +1,54 @@
+# Inputs of the last contributions_data.csv build, kept for incremental refreshes
+from asyncio.log import logger
+from typing import Dict, Optional
+
+import pandas as pd
+
+from snapshot_store import load_snapshot, load_snapshot_with_meta, save_snapshot, snapshot_lock
+
+BUILD_SNAPSHOT = "contributions_build"
+LOOKUP_SNAPSHOT = "contributions_user_lookup"
+COUNTS_SNAPSHOT = "contributions_counts"
+
+
+def save_contribution_state(
+    frame: pd.DataFrame,
+    user_lookup: pd.Series,
+    contributions: pd.DataFrame,
+    sources: Dict,
+):
+    """Persist the built frame, the phone -> user id lookup and per-user counts
+
+    `sources` identifies the input files the build was made from (see
+    `snapshot_store.source_signature`).
+    """
+    try:
+        lookup = pd.DataFrame({"phone": user_lookup.index, "user_id": user_lookup.values})
+        # The build snapshot's lock guards the whole group against concurrent builds
+        with snapshot_lock(BUILD_SNAPSHOT):
+            save_snapshot(LOOKUP_SNAPSHOT, lookup)
+            save_snapshot(COUNTS_SNAPSHOT, contributions.rename_axis("user_id").reset_index())
+            # Written last: its metadata marks the state as complete
+            save_snapshot(BUILD_SNAPSHOT, frame.copy(), meta={"sources": sources})
+    except Exception as e:
+        logger.warning(f"Could not save contribution build state: {e}")
+
+
+def load_contribution_state() -> Optional[Dict]:
+    """The last build state, or None if there is no complete one"""
+    with snapshot_lock(BUILD_SNAPSHOT):
+        stored = load_snapshot_with_meta(BUILD_SNAPSHOT)
+        if stored is None:
+            return None
+        meta, frame = stored
+        lookup = load_snapshot(LOOKUP_SNAPSHOT)
+        counts = load_snapshot(COUNTS_SNAPSHOT)
+    if lookup is None or counts is None:
+        return None
+
+    return {
+        "frame": frame,
+        "user_lookup": pd.Series(lookup["user_id"].values, index=lookup["phone"].values),
+        "contributions": counts.set_index("user_id"),
+        "sources": meta.get("sources", {}),
+    }
@@ -10,10 +10,16 @@ import json
 import time
 
 
-from records import fetch_records,fetch_all_records,fetch_records_with_cache,fetch_any_user_records,fetch_user_contributions,fetch_user_contributions_by_media_type
+from records import fetch_all_records_with_cache,fetch_records_window,fetch_records_with_cache,lookup_user_records,fetch_user_contributions
 from college_overview import display_college_overview
-from user import logger,login_user,verify_otp,request_otp,fetch_all_users,find_users_with_zero_records
-from Auth import decode_jwt_token,initialize_session_state,validate_session_with_refresh,CATEGORIES,CATEGORY_ID_TO_NAME
+from user import logger,login_user,verify_otp,request_otp,fetch_all_users,fetch_all_users_with_cache,find_inactive_users,get_users_frame
+from shared_cache import dataset_cache
+from user_search import get_user_search_index
+from summaries import RunningSummary,cached_summarize_frame,summary_cache,summary_table
+from exports import spool_export,export_frame,export_file_name,export_format_key,export_mime,available_export_formats,COLUMNAR_FORMATS,EXPORT_FORMAT_LABELS
+from records_store import window_covers
+from records_frame import get_records_frame,filter_frame_by_time,time_filter_bounds,TIME_FILTER_OVERALL,TIME_FILTER_24H,TIME_FILTER_7D,TIME_FILTER_CUSTOM
+from Auth import decode_jwt_token,get_auth_scope,initialize_session_state,validate_session_with_refresh,CATEGORIES
 
 
 
@@ -21,42 +27,77 @@ def display_zero_records_analysis():
     """Display analysis of users with zero records"""
     st.subheader("📊 Zero Records Analysis")
     
+    inactive_days = st.number_input(
+        "📅 Also include users with no uploads in the last N days (0 = never uploaded only)",
+        min_value=0, value=0, step=1, key="zero_records_inactive_days",
+    )
+    
     if st.button("🔍 Find Users with Zero Records"):
         with st.spinner("Analyzing user activity..."):
-            zero_record_users = find_users_with_zero_records(st.session_state.token)
+            # Both datasets come from the shared cache; the anti-join is vectorized
+            all_users = fetch_all_users_with_cache(st.session_state.token)
+            all_records = fetch_all_records_with_cache(st.session_state.token)
+            if not all_users or not all_records:
+                st.error("Failed to fetch required data")
+                return
             
-            if zero_record_users:
-                st.error(f"❌ Found {len(zero_record_users)} users with zero records uploaded")
-                
-                # Create DataFrame for better display
-                df_zero_users = pd.DataFrame(zero_record_users)
+            df_zero_users = find_inactive_users(all_users, all_records, int(inactive_days) or None)
+            total_users = len(get_users_frame(all_users))
+            label = f"no uploads in {int(inactive_days)} days" if inactive_days else "zero records uploaded"
+            
+            if not df_zero_users.empty:
+                st.error(f"❌ Found {len(df_zero_users)} users with {label}")
                 
                 # Display in expandable section
-                with st.expander(f"View {len(zero_record_users)} Users with Zero Records"):
+                columns = [c for c in ['name', 'id', 'phone', 'last_upload'] if c in df_zero_users.columns]
+                with st.expander(f"View {len(df_zero_users)} Users with {label.capitalize()}"):
                     st.dataframe(
-                        df_zero_users[['name', 'id', 'phone']],
+                        df_zero_users[columns].reset_index(drop=True),
                         use_container_width=True
                     )
                 
                 # Show summary statistics
                 col1, col2, col3 = st.columns(3)
                 with col1:
-                    st.metric("Users with Zero Records", len(zero_record_users))
+                    st.metric("Users with Zero Records" if not inactive_days else "Inactive Users", len(df_zero_users))
                 with col2:
-                    total_users = len(fetch_all_users(st.session_state.token))
-                    percentage = (len(zero_record_users) / total_users) * 100
+                    percentage = (len(df_zero_users) / total_users) * 100 if total_users else 0
                     st.metric("Percentage", f"{percentage:.1f}%")
                 with col3:
-                    st.metric("Active Users", total_users - len(zero_record_users))
+                    st.metric("Active Users", total_users - len(df_zero_users))
                     
             else:
-                st.success("✅ All users have uploaded at least one record!")
-
+                st.success(f"✅ No users with {label}!")
+
+
+
+def export_download_button(df, export_format, file_stem, compress=False, label=None, key=None):
+    """Download button that spools the export to a temporary file when clicked
+
+    Serializing is chunked and deferred to the click, but Streamlit then
+    reads the finished file into its in-memory media store to serve it:
+    each download still costs one in-memory copy of the export file
+    (compressed when gzip is on), held until the session moves on.
+    """
+    file_name = export_file_name(file_stem, export_format, compress)
+    if label is None:
+        label = f"⬇️ Download {EXPORT_FORMAT_LABELS[export_format_key(export_format)]}"
+        label += " (gzip)" if file_name.endswith(".gz") else ""
+    st.download_button(
+        label=label,
+        data=lambda: spool_export(df, export_format, compress),
+        file_name=file_name,
+        mime=export_mime(export_format, compress),
+        key=key
+    )
 
 
 # Export Changed to here 
 def create_export_section(df, summary):
-    """Create export section with proper state management"""
+    """Create export section with proper state management
+
+    `df` is a records frame; columnar formats export its typed columns.
+    """
     st.subheader("📥 Export Data")
     
     if df is None or df.empty:
@@ -66,11 +107,20 @@ def create_export_section(df, summary):
     col1, col2, col3 = st.columns(3)
     
     with col1:
+        formats = available_export_formats()
+        default_format = st.session_state.get("export_format", "csv")
         export_format = st.selectbox(
             "Export Format",
-            ["CSV", "JSON", "Excel"],
+            formats,
+            index=formats.index(default_format) if default_format in formats else 0,
+            format_func=EXPORT_FORMAT_LABELS.get,
             key="export_format_select"
         )
+        compress = st.checkbox(
+            "🗜️ Compress (gzip)",
+            value=st.session_state.get("export_compress", False),
+            key="export_compress_select"
+        )
     
     # Use session state to track export actions
     if "export_triggered" not in st.session_state:
@@ -81,6 +131,7 @@ def create_export_section(df, summary):
             st.session_state.export_triggered = True
             st.session_state.export_type = "records"
             st.session_state.export_format_selected = export_format
+            st.session_state.export_compress_selected = compress
     
     with col3:
         if st.button("📈 Export Summary", key="export_summary_btn"):
@@ -91,48 +142,37 @@ def create_export_section(df, summary):
     # Handle export after button press
     if st.session_state.get("export_triggered", False):
         export_type = st.session_state.get("export_type")
-        selected_format = st.session_state.get("export_format_selected", "CSV")
+        selected_format = export_format_key(st.session_state.get("export_format_selected", "csv"))
         
         if export_type == "records":
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             
-            if selected_format == "CSV":
-                csv_data = df.to_csv(index=False)
-                st.download_button(
-                    label="⬇️ Download CSV",
-                    data=csv_data,
-                    file_name=f"records_{timestamp}.csv",
-                    mime="text/csv",
-                    key="download_csv_final"
-                )
-            elif selected_format == "JSON":
-                json_data = df.to_json(orient='records', indent=2)
-                st.download_button(
-                    label="⬇️ Download JSON",
-                    data=json_data,
-                    file_name=f"records_{timestamp}.json",
-                    mime="application/json",
-                    key="download_json_final"
-                )
-            elif selected_format == "Excel":
-                from io import BytesIO
-                buffer = BytesIO()
-                df.to_excel(buffer, index=False, engine='openpyxl')
-                st.download_button(
-                    label="⬇️ Download Excel",
-                    data=buffer.getvalue(),
-                    file_name=f"records_{timestamp}.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    key="download_excel_final"
-                )
+            # Rows are written in chunks to a spool file only when the download is clicked
+            export_download_button(
+                export_frame(df, selected_format),
+                selected_format,
+                f"records_{timestamp}",
+                compress=st.session_state.get("export_compress_selected", False),
+                key=f"download_{selected_format}_final"
+            )
+        
+        elif export_type == "summary" and summary and selected_format in COLUMNAR_FORMATS:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            export_download_button(
+                summary_table(summary),
+                selected_format,
+                f"summary_{timestamp}",
+                label="⬇️ Download Summary",
+                key="download_summary_final"
+            )
         
         elif export_type == "summary" and summary:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             summary_data = {
-                "total_records": summary["total_records"],
-                "total_users": summary["total_users"],
-                "media_breakdown": dict(summary["media_type"]),
-                "category_breakdown": dict(summary["category"]),
+                "total_records": int(summary["total_records"]),
+                "total_users": int(summary["total_users"]),
+                "media_breakdown": {k: int(v) for k, v in dict(summary["media_type"]).items()},
+                "category_breakdown": {k: int(v) for k, v in dict(summary["category"]).items()},
                 "export_timestamp": datetime.now().isoformat()
             }
             json_data = json.dumps(summary_data, indent=2)
@@ -169,127 +209,22 @@ def create_user_mapping(users: List[Dict]) -> Dict[str, str]:
         return {}
 
 
+# Minimum seconds between live re-renders while records stream in
+STREAM_RENDER_INTERVAL = 0.5
+
+
 # Enhanced Data Processing Functions
-def advanced_summarize(records: List[Dict], filters: Dict = None) -> Optional[Dict]:
-    """Advanced data summarization with filtering and more metrics"""
-    if not records:
+def advanced_summarize(records, filters: Dict = None) -> Optional[Dict]:
+    """Advanced data summarization with filtering and more metrics
+
+    Accepts a list of records or an already built canonical records frame.
+    """
+    if records is None or len(records) == 0:
         return None
 
     try:
-        df = pd.DataFrame(records)
-        df["category"] = df["category_id"].map(CATEGORY_ID_TO_NAME).fillna("Unknown")
-        df["created_at"] = pd.to_datetime(df["created_at"], errors="coerce")
-        df["date"] = df["created_at"].dt.date
-        df["hour"] = df["created_at"].dt.hour
-        df["day_of_week"] = df["created_at"].dt.day_name()
-        df["month"] = df["created_at"].dt.month_name()
-        df["week"] = df["created_at"].dt.isocalendar().week
-
-        # Apply filters if provided
-        if filters:
-            if filters.get("date_range"):
-                start_date, end_date = filters["date_range"]
-                df = df[(df["date"] >= start_date) & (df["date"] <= end_date)]
-            if filters.get("categories"):
-                df = df[df["category"].isin(filters["categories"])]
-            if filters.get("media_types"):
-                df = df[df["media_type"].isin(filters["media_types"])]
-            if filters.get("status"):
-                df = df[df["status"].isin(filters["status"])]
-
-        if df.empty:
-            return None
-
-        # Calculate total users
-        total_users = df["user_id"].nunique() if "user_id" in df.columns else 0
-
-        # Enhanced metrics with media type breakdown
-        media_counts = df["media_type"].value_counts()
-
-        # Calculate file size statistics
-        total_file_size = 0
-        file_size_by_media_type = {}
-        avg_file_size_by_media_type = {}
-        file_size_by_category = {}
-        file_size_by_date = {}
-
-        # Check if 'size' column exists in the dataframe
-        if "size" in df.columns:
-            # Convert size to numeric, handling any non-numeric values
-            df["size"] = pd.to_numeric(df["size"], errors="coerce").fillna(0)
-
-            # Calculate total file size
-            total_file_size = df["size"].sum()
-
-            # Calculate average file size
-            avg_file_size = total_file_size / len(df) if len(df) > 0 else 0
-
-            # Calculate file size by media type
-            for media_type in df["media_type"].unique():
-                media_df = df[df["media_type"] == media_type]
-                media_size = media_df["size"].sum()
-                file_size_by_media_type[media_type] = media_size
-
-                # Calculate average file size by media type
-                avg_size = media_size / len(media_df) if len(media_df) > 0 else 0
-                avg_file_size_by_media_type[media_type] = avg_size
-
-            # Calculate file size by category
-            for category in df["category"].unique():
-                category_df = df[df["category"] == category]
-                category_size = category_df["size"].sum()
-                file_size_by_category[category] = category_size
-
-            # Calculate file size by date (for storage growth tracking)
-            date_groups = df.groupby("date")
-            for date, group in date_groups:
-                file_size_by_date[date] = group["size"].sum()
-
-        summary = {
-            "total_records": len(df),
-            "total_users": total_users,
-            "unique_dates": df["date"].nunique(),
-            "date_range": (df["date"].min(), df["date"].max()),
-            "avg_daily_uploads": len(df) / max(df["date"].nunique(), 1),
-            "media_type": media_counts,
-            "status": df["status"].value_counts(),
-            "category": df["category"].value_counts(),
-            "uploads_per_day": df.groupby("date").size(),
-            "uploads_per_hour": df.groupby("hour").size(),
-            "uploads_per_weekday": df.groupby("day_of_week").size(),
-            "uploads_per_month": df.groupby("month").size(),
-            "uploads_per_week": df.groupby("week").size(),
-            "peak_upload_day": df.groupby("date").size().idxmax(),
-            "peak_upload_count": df.groupby("date").size().max(),
-            "most_active_hour": df.groupby("hour").size().idxmax(),
-            "most_active_weekday": df.groupby("day_of_week").size().idxmax(),
-            "category_diversity": len(df["category"].unique()),
-            "media_diversity": len(df["media_type"].unique()),
-            "weekly_growth": calculate_growth_rate(df.groupby("week").size()),
-            "monthly_growth": calculate_growth_rate(df.groupby("month").size()),
-            # New: Individual media type counts
-            "images_count": media_counts.get("image", 0),
-            "videos_count": media_counts.get("video", 0),
-            "texts_count": media_counts.get("text", 0),
-            "audios_count": media_counts.get("audio", 0),
-            # File size statistics
-            "total_file_size": total_file_size,
-            "avg_file_size": avg_file_size if "avg_file_size" in locals() else 0,
-            "file_size_by_media_type": file_size_by_media_type,
-            "avg_file_size_by_media_type": avg_file_size_by_media_type,
-            "file_size_by_category": file_size_by_category,
-            "file_size_by_date": file_size_by_date,
-            # Storage growth metrics
-            "storage_growth_weekly": calculate_storage_growth_rate(
-                file_size_by_date, "weekly"
-            ),
-            "storage_growth_monthly": calculate_storage_growth_rate(
-                file_size_by_date, "monthly"
-            ),
-            "df": df,
-        }
-
-        return summary
+        df = records if isinstance(records, pd.DataFrame) else get_records_frame(records)
+        return cached_summarize_frame(df, filters)
 
     except Exception as e:
         logger.error(f"Error in advanced summarization: {e}")
@@ -320,59 +255,6 @@ def bytes_to_mb(size_in_bytes: int) -> float:
     return size_in_bytes / (1024 * 1024)
 
 
-def calculate_growth_rate(series: pd.Series) -> float:
-    """Calculate growth rate for time series data"""
-    if len(series) < 2:
-        return 0.0
-
-    current = series.iloc[-1]
-    previous = series.iloc[-2]
-
-    if previous == 0:
-        return 100.0 if current > 0 else 0.0
-
-    return ((current - previous) / previous) * 100
-
-
-def calculate_storage_growth_rate(
-    file_size_by_date: Dict, period: str = "weekly"
-) -> float:
-    """Calculate storage growth rate over a specified period"""
-    if not file_size_by_date or len(file_size_by_date) < 2:
-        return 0.0
-
-    # Convert dictionary to Series for easier manipulation
-    date_series = pd.Series(file_size_by_date)
-    date_series.index = pd.to_datetime(date_series.index)
-    date_series = date_series.sort_index()
-
-    if period == "weekly":
-        # Group by week and calculate weekly totals
-        weekly_data = date_series.resample("W").sum()
-        if len(weekly_data) < 2:
-            return 0.0
-
-        current = weekly_data.iloc[-1]
-        previous = weekly_data.iloc[-2]
-    elif period == "monthly":
-        # Group by month and calculate monthly totals
-        monthly_data = date_series.resample("M").sum()
-        if len(monthly_data) < 2:
-            return 0.0
-
-        current = monthly_data.iloc[-1]
-        previous = monthly_data.iloc[-2]
-    else:
-        # Default to comparing the latest two dates
-        current = date_series.iloc[-1]
-        previous = date_series.iloc[-2]
-
-    if previous == 0:
-        return 100.0 if current > 0 else 0.0
-
-    return ((current - previous) / previous) * 100
-
-
 def get_data_insights(summary: Dict) -> List[str]:
     """Generate intelligent insights from data"""
     insights = []
@@ -471,12 +353,14 @@ def get_data_insights(summary: Dict) -> List[str]:
 
 
 def create_leaderboard_with_names(
-    df: pd.DataFrame, user_mapping: Dict[str, str]
+    uploads_per_user: pd.Series, user_mapping: Dict[str, str]
 ) -> pd.DataFrame:
-    """Create leaderboard showing user names instead of IDs"""
+    """Create leaderboard showing user names instead of IDs
+
+    `uploads_per_user` is the summary's contribution count per user id.
+    """
     try:
-        # Count contributions per user
-        user_contributions = df.groupby("user_id").size().reset_index()
+        user_contributions = uploads_per_user.rename_axis("user_id").reset_index()
         user_contributions.columns = ["user_id", "contributions"]
 
         # Map user IDs to names
@@ -669,8 +553,8 @@ def create_advanced_overview_dashboard(
     st.markdown("---")
     st.markdown("## 🏆 Top Contributors Leaderboard")
 
-    if user_mapping and summary.get("df") is not None:
-        leaderboard = create_leaderboard_with_names(summary["df"], user_mapping)
+    if user_mapping and summary.get("uploads_per_user") is not None:
+        leaderboard = create_leaderboard_with_names(summary["uploads_per_user"], user_mapping)
 
         if not leaderboard.empty:
             # Display top 10 contributors
@@ -855,6 +739,43 @@ def create_advanced_overview_dashboard(
     # Media Gallery Section for Database Overview
 
 
+def create_streaming_overview(snapshot: Dict):
+    """Partial overview (KPIs, media mix, timeline) while pages are arriving"""
+    st.caption(
+        f"⏳ Live view: {snapshot['total_records']:,} records from {snapshot['pages']} pages so far"
+    )
+
+    col1, col2, col3, col4, col5, col6 = st.columns(6)
+    col1.metric("📊 Records", f"{snapshot['total_records']:,}")
+    col2.metric("👥 Active Users", f"{snapshot['total_users']:,}")
+    col3.metric("📷 Images", f"{snapshot['images_count']:,}")
+    col4.metric("🎥 Videos", f"{snapshot['videos_count']:,}")
+    col5.metric("🎵 Audio", f"{snapshot['audios_count']:,}")
+    col6.metric("💾 Storage", format_file_size(snapshot["total_file_size"]))
+
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        if not snapshot["media_type"].empty:
+            fig = px.pie(
+                values=snapshot["media_type"].values,
+                names=snapshot["media_type"].index,
+                title="Media Types",
+                color_discrete_sequence=px.colors.qualitative.Set3,
+            )
+            fig.update_layout(height=350, title_x=0.5)
+            st.plotly_chart(fig, use_container_width=True, key=f"stream_media_{snapshot['pages']}")
+
+    with col2:
+        if not snapshot["uploads_per_day"].empty:
+            timeline_df = snapshot["uploads_per_day"].reset_index()
+            timeline_df.columns = ["date", "uploads"]
+
+            fig = px.line(timeline_df, x="date", y="uploads", title="Daily Upload Activity")
+            fig.update_layout(height=350, title_x=0.5, xaxis_title="Date", yaxis_title="Number of Uploads")
+            fig.update_traces(line_color="#FF6B6B", line_width=3)
+            st.plotly_chart(fig, use_container_width=True, key=f"stream_timeline_{snapshot['pages']}")
+
+
 def create_user_analytics_dashboard(user_records: List[Dict], username: str):
     """Create personalized user analytics dashboard"""
     if not user_records:
@@ -1201,10 +1122,14 @@ def main():
             )
             st.session_state.auto_refresh = auto_refresh
 
+            formats = available_export_formats()
             export_format = st.selectbox(
                 "📊 Export Format",
-                ["csv", "excel", "json"],
-                index=0 if st.session_state.export_format == "csv" else 1,
+                formats,
+                index=formats.index(st.session_state.export_format)
+                if st.session_state.export_format in formats
+                else 0,
+                format_func=EXPORT_FORMAT_LABELS.get,
             )
             st.session_state.export_format = export_format
 
@@ -1376,27 +1301,18 @@ def main():
 
                 with col1:
                     if st.button("📥 Export Data"):
-                        df = pd.DataFrame(user_records)
-
-                        if st.session_state.export_format == "csv":
-                            csv = df.to_csv(index=False)
-                            st.download_button(
-                                "💾 Download CSV",
-                                csv,
-                                f"my_records_{datetime.now().strftime('%Y%m%d')}.csv",
-                                "text/csv",
-                            )
-                        elif st.session_state.export_format == "excel":
-                            from io import BytesIO
-
-                            buffer = BytesIO()
-                            df.to_excel(buffer, index=False)
-                            st.download_button(
-                                "💾 Download Excel",
-                                buffer.getvalue(),
-                                f"my_records_{datetime.now().strftime('%Y%m%d')}.xlsx",
-                                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                            )
+                        df = export_frame(
+                            get_records_frame(user_records), st.session_state.export_format
+                        )
+
+                        export_download_button(
+                            df,
+                            st.session_state.export_format,
+                            f"my_records_{datetime.now().strftime('%Y%m%d')}",
+                            compress=st.session_state.export_compress,
+                            label="💾 Download "
+                            + EXPORT_FORMAT_LABELS[st.session_state.export_format],
+                        )
             else:
                 st.info("Click 'Refresh My Data' to load your analytics")
 
@@ -1407,7 +1323,7 @@ def main():
         if st.session_state.users_list is None:
             if st.button("👥 Load Users List", type="primary"):
                 with st.spinner("Loading users..."):
-                    users = fetch_all_users(st.session_state.token)
+                    users = fetch_all_users_with_cache(st.session_state.token)
                     if users:
                         st.session_state.users_list = users
                         st.session_state.user_mapping = create_user_mapping(users)
@@ -1419,27 +1335,35 @@ def main():
             # User selection methods
             search_method = st.radio(
                 "Choose search method:",
-                ["🔤 Select from Dropdown", "🔢 Enter User ID"],
+                ["🔤 Search by Name / Phone", "🔢 Enter User ID"],
                 horizontal=True,
             )
 
             selected_user_id = None
 
-            if search_method == "🔤 Select from Dropdown":
-                if st.session_state.user_mapping:
-                    # Create options with both name and ID
-                    user_options = [
-                        f"{name} ({user_id})"
-                        for user_id, name in st.session_state.user_mapping.items()
-                    ]
+            if search_method == "🔤 Search by Name / Phone":
+                # Only the top matches are sent to the browser, never the whole user list
+                search_index = get_user_search_index(st.session_state.users_list)
+                query = st.text_input(
+                    "🔎 Search users:",
+                    placeholder="Type a name, phone number or user ID",
+                    key="user_search_query",
+                )
 
-                    selected_option = st.selectbox(
-                        "👤 Select User:", [""] + user_options, key="user_dropdown"
+                matches = search_index.search(query) if query else []
+                if matches:
+                    match_labels = {
+                        user["id"]: f"{user.get('name') or 'Unknown User'} · {user.get('phone') or '-'} · {user['id'][:8]}"
+                        for user in matches
+                    }
+                    selected_user_id = st.selectbox(
+                        f"👤 Select User ({len(matches)} best matches):",
+                        list(match_labels),
+                        format_func=match_labels.get,
+                        key="user_dropdown",
                     )
-
-                    if selected_option:
-                        # Extract user ID from the selected option
-                        selected_user_id = selected_option.split("(")[-1].rstrip(")")
+                elif query:
+                    st.info("No users match your search")
 
             else:  # Manual ID entry
                 selected_user_id = st.text_input(
@@ -1449,7 +1373,8 @@ def main():
                 )
 
             if selected_user_id and st.button("🔍 Search User Records", type="primary"):
-                user_records = fetch_any_user_records(
+                # Served from the loaded database when fresh, else from the API
+                user_records = lookup_user_records(
                     selected_user_id, st.session_state.token
                 )
 
@@ -1466,207 +1391,240 @@ def main():
                     
                     st.markdown("---")
                     st.markdown("### 📥 Export User Data")
-                    df = pd.DataFrame(user_records)
+                    user_frame = get_records_frame(user_records)
                     user_name = st.session_state.user_mapping.get(selected_user_id, selected_user_id)
                     
                     # Create a modified summary for this user
-                    user_summary = advanced_summarize(user_records)
-                    create_export_section(df, user_summary)
+                    user_summary = advanced_summarize(user_frame)
+                    create_export_section(user_frame, user_summary)
                     display_zero_records_analysis()
                 else:
                     st.warning(f"No records found for user: {selected_user_id}")
 
     elif dashboard_mode == "🌐 Database Overview": 
-     st.markdown("## 🌐 Database Overview & Analytics") 
-    
-    # Time filter selection
-    st.markdown("### ⏰ Time Filter")
-    time_filter = st.selectbox(
-        "Select time range:",
-        ["📊 Overall", "📅 Last 24 Hours", "📆 Last 7 Days"],
-        key="db_time_filter"
-    )
-    
-    # Helper function to filter records by time
-    def filter_records_by_time(records, time_filter):
-        if time_filter == "📊 Overall":
-            return records
-        
-        from datetime import datetime, timedelta
-        import pytz
-        
-        now = datetime.now(pytz.UTC)
-        
-        if time_filter == "📅 Last 24 Hours":
-            cutoff_time = now - timedelta(hours=24)
-        elif time_filter == "📆 Last 7 Days":
-            cutoff_time = now - timedelta(days=7)
+        st.markdown("## 🌐 Database Overview & Analytics") 
+
+        # Time filter selection
+        st.markdown("### ⏰ Time Filter")
+        time_filter = st.selectbox(
+            "Select time range:",
+            [TIME_FILTER_OVERALL, TIME_FILTER_24H, TIME_FILTER_7D, TIME_FILTER_CUSTOM],
+            key="db_time_filter"
+        )
+
+        date_range = None
+        if time_filter == TIME_FILTER_CUSTOM:
+            date_range = st.date_input(
+                "Select date range (UTC):",
+                value=(datetime.now().date(), datetime.now().date()),
+                key="db_custom_range",
+            )
+            if not isinstance(date_range, (list, tuple)) or len(date_range) != 2:
+                date_range = None
+
+        # Display selected time range info
+        if time_filter == TIME_FILTER_24H:
+            st.info("📅 Showing data from the last 24 hours")
+        elif time_filter == TIME_FILTER_7D:
+            st.info("📆 Showing data from the last 7 days")
+        elif time_filter == TIME_FILTER_CUSTOM:
+            if date_range:
+                st.info(f"🗓️ Showing data from {date_range[0]} to {date_range[1]}")
+            else:
+                st.info("🗓️ Select a start and end date")
         else:
-            return records
-        
-        filtered_records = []
-        for record in records:
-            try:
-                # Try different timestamp field names
-                timestamp_str = record.get('timestamp') or record.get('created_at') or record.get('date')
-                if timestamp_str:
-                    # Parse timestamp (adjust format as needed)
-                    if 'T' in timestamp_str:
-                        record_time = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                    else:
-                        record_time = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
-                    
-                    # Make timezone aware if needed
-                    if record_time.tzinfo is None:
-                        record_time = pytz.UTC.localize(record_time)
-                    
-                    if record_time >= cutoff_time:
-                        filtered_records.append(record)
-            except (ValueError, TypeError, AttributeError):
-                # If timestamp parsing fails, include the record in overall view
-                if time_filter == "📊 Overall":
-                    filtered_records.append(record)
-                continue
-        
-        return filtered_records
-    
-    # Display selected time range info
-    if time_filter == "📅 Last 24 Hours":
-        st.info("📅 Showing data from the last 24 hours")
-    elif time_filter == "📆 Last 7 Days":
-        st.info("📆 Showing data from the last 7 days")
-    else:
-        st.info("📊 Showing all-time data")
- 
-    if st.button("📊 Load Database Overview", type="primary"): 
-        # Load all records 
-        all_records = fetch_all_records(st.session_state.token) 
- 
-        if all_records: 
-            # Filter records based on selected time range
-            filtered_records = filter_records_by_time(all_records, time_filter)
-            
-            st.session_state.database_overview = filtered_records
-            st.session_state.database_overview_filter = time_filter
-            st.session_state.database_overview_all = all_records  # Keep original for reference
- 
-            # Load users if not already loaded 
-            if st.session_state.users_list is None: 
-                with st.spinner("Loading users for leaderboard..."): 
-                    users = fetch_all_users(st.session_state.token) 
-                    if users: 
-                        st.session_state.users_list = users 
-                        st.session_state.user_mapping = create_user_mapping(users) 
- 
-            # Create summary from filtered records
-            summary = advanced_summarize(filtered_records) 
- 
+            st.info("📊 Showing all-time data")
+
+        full_resync = st.checkbox(
+            "🔁 Full resync",
+            value=False,
+            help="Re-download every record instead of only the uploads since the last sync",
+            key="db_full_resync",
+        )
+
+        live_view = st.checkbox(
+            "⚡ Show results while loading",
+            value=True,
+            help="Render running totals after every downloaded page during a full crawl",
+            key="db_live_view",
+        )
+
+        window_start, window_end = time_filter_bounds(time_filter, date_range)
+
+        if st.button("📊 Load Database Overview", type="primary"): 
+            on_page = None
+            if live_view:
+                # Running totals re-rendered as pages arrive (throttled)
+                live_placeholder = st.empty()
+                running = RunningSummary()
+                last_render = [0.0]
+
+                def on_page(page):
+                    running.update(page)
+                    if running.pages == 1 or time.time() - last_render[0] >= STREAM_RENDER_INTERVAL:
+                        with live_placeholder.container():
+                            create_streaming_overview(running.snapshot())
+                        last_render[0] = time.time()
+
+            if window_start is not None and not full_resync:
+                # Time-windowed view: sync, then read only the month partitions it touches
+                window = fetch_records_window(
+                    st.session_state.token, window_start, window_end, on_page=on_page
+                )
+                all_records = window.get("records", [])
+                total_records = window.get("rows", len(all_records))
+                records_span = window.get("span")
+            else:
+                # Load all records (incremental sync unless a full resync is requested)
+                all_records = fetch_all_records_with_cache(
+                    st.session_state.token, full_refresh=full_resync, on_page=on_page
+                )
+                total_records = len(all_records)
+                records_span = None
+            if live_view:
+                live_placeholder.empty()
+
+            if all_records: 
+                # Build the canonical frame once; every later window switch is a vectorized slice
+                records_frame = get_records_frame(all_records)
+                filtered_records = filter_frame_by_time(records_frame, time_filter, date_range)
+
+                st.session_state.database_overview = filtered_records
+                st.session_state.database_overview_filter = (time_filter, date_range)
+                st.session_state.database_overview_all = all_records  # Keep original for reference
+                st.session_state.database_overview_frame = records_frame
+                st.session_state.database_overview_total = total_records
+                st.session_state.database_overview_span = records_span
+
+                # Load users if not already loaded 
+                if st.session_state.users_list is None: 
+                    with st.spinner("Loading users for leaderboard..."): 
+                        users = fetch_all_users_with_cache(st.session_state.token) 
+                        if users: 
+                            st.session_state.users_list = users 
+                            st.session_state.user_mapping = create_user_mapping(users) 
+
+                # Create summary from filtered records
+                summary = advanced_summarize(filtered_records) 
+
+                if summary: 
+                    # Get total users count 
+                    total_users = ( 
+                        len(st.session_state.users_list) 
+                        if st.session_state.users_list 
+                        else 0 
+                    ) 
+
+                    # Display filter summary
+                    st.markdown("---")
+                    col1, col2, col3 = st.columns(3)
+
+                    with col1:
+                        st.metric("📊 Total Records", total_records)
+
+                    with col2:
+                        st.metric("🔍 Filtered Records", len(filtered_records))
+
+                    with col3:
+                        filter_percentage = (len(filtered_records) / total_records * 100) if total_records > 0 else 0
+                        st.metric("📈 Filter Coverage", f"{filter_percentage:.1f}%")
+
+                    # Create enhanced dashboard with filtered data
+                    create_advanced_overview_dashboard( 
+                        summary, st.session_state.user_mapping, total_users 
+                    ) 
+
+                    # Export functionality for database overview
+                    st.markdown("---") 
+                    st.markdown("### 📥 Export Database Summary") 
+                    create_export_section(filtered_records, summary)  # Use filtered records
+
+                    # Add zero records analysis 
+                    st.markdown("---") 
+                    st.subheader("👥 User Activity Analysis") 
+
+                    col1, col2, col3, col4 = st.columns(4) 
+
+                    with col1: 
+                        total_users = len(fetch_all_users_with_cache(st.session_state.token)) 
+                        st.metric("Total Registered Users", total_users) 
+
+                    with col2: 
+                        active_users = summary.get("total_users", 0) 
+                        st.metric(f"Active Users ({time_filter.split(' ')[-1] if time_filter != '📊 Overall' else 'Overall'})", active_users) 
+
+                    with col3: 
+                        inactive_users = total_users - active_users 
+                        st.metric("Users with Zero Records", inactive_users) 
+
+                    with col4: 
+                        activity_rate = (active_users / total_users) * 100 if total_users > 0 else 0 
+                        st.metric("Activity Rate", f"{activity_rate:.1f}%") 
+                else:
+                    st.warning(f"No records found for {time_filter.lower()}")
+
+        # Show existing overview if available (and its months cover the selected window)
+        elif st.session_state.get("database_overview_all") and window_covers(
+            st.session_state.get("database_overview_span"), window_start, window_end
+        ): 
+            # Re-apply the time filter in place when it changed (no reload, no re-parse)
+            current_filter = (time_filter, date_range)
+            if st.session_state.get("database_overview_filter") != current_filter:
+                records_frame = st.session_state.get("database_overview_frame")
+                if records_frame is None:
+                    records_frame = get_records_frame(st.session_state.database_overview_all)
+                    st.session_state.database_overview_frame = records_frame
+
+                st.session_state.database_overview = filter_frame_by_time(
+                    records_frame, time_filter, date_range
+                )
+                st.session_state.database_overview_filter = current_filter
+
+            st.info( 
+                f"📊 Database overview loaded for '{time_filter}'. Click 'Load Database Overview' to refresh." 
+            ) 
+
+            summary = advanced_summarize(st.session_state.database_overview) 
             if summary: 
-                # Get total users count 
                 total_users = ( 
                     len(st.session_state.users_list) 
                     if st.session_state.users_list 
                     else 0 
                 ) 
-                
-                # Display filter summary
+
+                # Display current filter info
                 st.markdown("---")
                 col1, col2, col3 = st.columns(3)
-                
+
+                all_records_count = st.session_state.get(
+                    "database_overview_total", len(st.session_state.database_overview_all)
+                )
+                filtered_records_count = len(st.session_state.database_overview)
+
                 with col1:
-                    st.metric("📊 Total Records", len(all_records))
-                    
+                    st.metric("📊 Total Records", all_records_count)
+
                 with col2:
-                    st.metric("🔍 Filtered Records", len(filtered_records))
-                    
+                    st.metric("🔍 Filtered Records", filtered_records_count)
+
                 with col3:
-                    filter_percentage = (len(filtered_records) / len(all_records) * 100) if len(all_records) > 0 else 0
+                    filter_percentage = (filtered_records_count / all_records_count * 100) if all_records_count > 0 else 0
                     st.metric("📈 Filter Coverage", f"{filter_percentage:.1f}%")
- 
-                # Create enhanced dashboard with filtered data
+
                 create_advanced_overview_dashboard( 
                     summary, st.session_state.user_mapping, total_users 
                 ) 
- 
-                # Export functionality for database overview
+
+                # Add export section for existing overview too 
                 st.markdown("---") 
                 st.markdown("### 📥 Export Database Summary") 
-                df = pd.DataFrame(filtered_records)  # Use filtered records
-                create_export_section(df, summary) 
-                 
-                # Add zero records analysis 
-                st.markdown("---") 
-                st.subheader("👥 User Activity Analysis") 
-                 
-                col1, col2, col3, col4 = st.columns(4) 
-                 
-                with col1: 
-                    total_users = len(fetch_all_users(st.session_state.token)) 
-                    st.metric("Total Registered Users", total_users) 
-                 
-                with col2: 
-                    active_users = summary.get("total_users", 0) 
-                    st.metric(f"Active Users ({time_filter.split(' ')[-1] if time_filter != '📊 Overall' else 'Overall'})", active_users) 
-                 
-                with col3: 
-                    inactive_users = total_users - active_users 
-                    st.metric("Users with Zero Records", inactive_users) 
-                 
-                with col4: 
-                    activity_rate = (active_users / total_users) * 100 if total_users > 0 else 0 
-                    st.metric("Activity Rate", f"{activity_rate:.1f}%") 
+                create_export_section(st.session_state.database_overview, summary)
+
             else:
                 st.warning(f"No records found for {time_filter.lower()}")
- 
-    # Show existing overview if available 
-    elif st.session_state.database_overview: 
-        # Check if filter has changed
-        current_filter = getattr(st.session_state, 'database_overview_filter', "📊 Overall")
-        
-        if current_filter != time_filter:
-            st.warning(f"⚠️ Currently showing data for '{current_filter}'. Click 'Load Database Overview' to apply '{time_filter}' filter.")
-        else:
-            st.info( 
-                f"📊 Database overview already loaded for '{time_filter}'. Click 'Load Database Overview' to refresh." 
-            ) 
- 
-        summary = advanced_summarize(st.session_state.database_overview) 
-        if summary: 
-            total_users = ( 
-                len(st.session_state.users_list) 
-                if st.session_state.users_list 
-                else 0 
-            ) 
-            
-            # Display current filter info
-            st.markdown("---")
-            col1, col2, col3 = st.columns(3)
-            
-            all_records_count = len(getattr(st.session_state, 'database_overview_all', st.session_state.database_overview))
-            filtered_records_count = len(st.session_state.database_overview)
-            
-            with col1:
-                st.metric("📊 Total Records", all_records_count)
-                
-            with col2:
-                st.metric("🔍 Filtered Records", filtered_records_count)
-                
-            with col3:
-                filter_percentage = (filtered_records_count / all_records_count * 100) if all_records_count > 0 else 0
-                st.metric("📈 Filter Coverage", f"{filter_percentage:.1f}%")
-            
-            create_advanced_overview_dashboard( 
-                summary, st.session_state.user_mapping, total_users 
-            ) 
-             
-            # Add export section for existing overview too 
-            st.markdown("---") 
-            st.markdown("### 📥 Export Database Summary") 
-            df = pd.DataFrame(st.session_state.database_overview) 
-            create_export_section(df, summary)
-    
+
         else:
-          st.info("👆 Click 'Load Database Overview' to start analyzing your database with the selected time filter.")
+            st.info("👆 Click 'Load Database Overview' to start analyzing your database with the selected time filter.")
 
     elif dashboard_mode == "🏫 College Overview":
        display_college_overview(fetch_all_users, fetch_user_contributions, st.session_state.token)
@@ -1698,12 +1656,19 @@ def main():
             st.markdown("### 📊 Data")
 
             # Export settings
+            formats = available_export_formats()
             new_export_format = st.selectbox(
                 "Default Export Format",
-                ["csv", "excel", "json"],
-                index=["csv", "excel", "json"].index(st.session_state.export_format),
+                formats,
+                index=formats.index(st.session_state.export_format)
+                if st.session_state.export_format in formats
+                else 0,
+                format_func=EXPORT_FORMAT_LABELS.get,
             )
             st.session_state.export_format = new_export_format
+            st.session_state.export_compress = st.checkbox(
+                "Compress exports (gzip)", value=st.session_state.export_compress
+            )
 
             # Auto-refresh settings
             new_auto_refresh = st.checkbox(
@@ -1726,8 +1691,15 @@ def main():
                 for key in keys_to_clear:
                     del st.session_state[key]
                 st.session_state.database_overview = None
+                st.session_state.database_overview_all = None
+                st.session_state.database_overview_frame = None
+                st.session_state.database_overview_span = None
                 st.session_state.users_list = None
                 st.session_state.user_mapping = {}
+                # Drop the shared datasets cached for this auth scope
+                scope = get_auth_scope(st.session_state.token)
+                dataset_cache.invalidate(lambda key: key[1] == scope)
+                summary_cache.invalidate()
                 st.success("✅ Cache cleared successfully!")
 
         with col2:
@@ -0,0 +1,149 @@
+# Chunked record exports spooled to temporary files
+import gzip
+import io
+import tempfile
+from typing import BinaryIO, List
+
+import pandas as pd
+
+from records_frame import export_view, typed_export_view
+from snapshot_store import PARQUET_AVAILABLE
+
+EXPORT_CHUNK_ROWS = 50_000
+
+# Format -> (file extension, mime type)
+EXPORT_FORMATS = {
+    "csv": (".csv", "text/csv"),
+    "json": (".json", "application/json"),
+    "excel": (".xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "parquet": (".parquet", "application/vnd.apache.parquet"),
+    "arrow": (".arrow", "application/vnd.apache.arrow.file"),
+}
+EXPORT_FORMAT_LABELS = {
+    "csv": "CSV",
+    "json": "JSON",
+    "excel": "Excel",
+    "parquet": "Parquet",
+    "arrow": "Arrow IPC",
+}
+# Typed formats written with pyarrow; they keep datetimes and categoricals
+COLUMNAR_FORMATS = {"parquet", "arrow"}
+# Formats that are already compressed and are never gzipped
+PACKED_FORMATS = {"excel"} | COLUMNAR_FORMATS
+COLUMNAR_COMPRESSION = "zstd"
+
+
+def available_export_formats() -> List[str]:
+    """Export formats usable in this deployment (columnar ones need pyarrow)"""
+    return [key for key in EXPORT_FORMATS if PARQUET_AVAILABLE or key not in COLUMNAR_FORMATS]
+
+
+def export_frame(frame: pd.DataFrame, fmt: str) -> pd.DataFrame:
+    """The columns of a records frame to export: typed for columnar formats, raw otherwise"""
+    if export_format_key(fmt) in COLUMNAR_FORMATS:
+        return typed_export_view(frame)
+    return export_view(frame)
+
+
+def _chunks(df: pd.DataFrame, chunk_rows: int):
+    for start in range(0, len(df), chunk_rows):
+        yield start, df.iloc[start:start + chunk_rows]
+
+
+def write_csv(df: pd.DataFrame, handle, chunk_rows: int = EXPORT_CHUNK_ROWS):
+    """Write `df` as CSV to a text handle, one chunk of rows at a time"""
+    if df.empty:
+        df.to_csv(handle, index=False)
+        return
+    for start, chunk in _chunks(df, chunk_rows):
+        chunk.to_csv(handle, index=False, header=start == 0)
+
+
+def write_json(df: pd.DataFrame, handle, chunk_rows: int = EXPORT_CHUNK_ROWS):
+    """Write `df` as one JSON array of records, one chunk of rows at a time"""
+    handle.write("[")
+    for start, chunk in _chunks(df, chunk_rows):
+        # Each chunk is its own array: drop the brackets and join with commas
+        body = chunk.to_json(orient="records", indent=2).strip()[1:-1].rstrip()
+        handle.write(("," if start else "") + body)
+    handle.write("\n]")
+
+
+def write_columnar(df: pd.DataFrame, handle, fmt: str, chunk_rows: int = EXPORT_CHUNK_ROWS):
+    """Write `df` as Parquet (one row group per chunk) or an Arrow IPC file
+
+    The schema, including the pandas metadata that restores datetimes and
+    categoricals on load, is inferred once for the whole frame.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(handle, schema, compression=COLUMNAR_COMPRESSION)
+    else:
+        options = pa.ipc.IpcWriteOptions(compression=COLUMNAR_COMPRESSION)
+        writer = pa.ipc.new_file(handle, schema, options=options)
+
+    with writer:
+        for _, chunk in _chunks(df, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def export_format_key(fmt: str) -> str:
+    key = fmt.lower()
+    if key not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    return key
+
+
+def is_compressed(fmt: str, compress: bool) -> bool:
+    return compress and export_format_key(fmt) not in PACKED_FORMATS
+
+
+def export_file_name(stem: str, fmt: str, compress: bool = False) -> str:
+    extension = EXPORT_FORMATS[export_format_key(fmt)][0]
+    return f"{stem}{extension}" + (".gz" if is_compressed(fmt, compress) else "")
+
+
+def export_mime(fmt: str, compress: bool = False) -> str:
+    if is_compressed(fmt, compress):
+        return "application/gzip"
+    return EXPORT_FORMATS[export_format_key(fmt)][1]
+
+
+def spool_export(
+    df: pd.DataFrame,
+    fmt: str,
+    compress: bool = False,
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+) -> BinaryIO:
+    """Export `df` to a temporary file and return it rewound for reading
+
+    Rows are serialized in chunks straight into the file (through gzip when
+    `compress` is set), so the whole export never exists as one string.
+    The file is deleted when it is closed or garbage collected. Whoever
+    serves it decides whether it is read back into memory (see
+    `dashboard.export_download_button`).
+    """
+    key = export_format_key(fmt)
+    spool = tempfile.TemporaryFile(prefix="export-", suffix=EXPORT_FORMATS[key][0])
+
+    if key == "excel":
+        df.to_excel(spool, index=False, engine="openpyxl")
+    elif key in COLUMNAR_FORMATS:
+        write_columnar(df, spool, key, chunk_rows)
+    else:
+        target = gzip.GzipFile(fileobj=spool, mode="wb") if compress else spool
+        text = io.TextIOWrapper(target, encoding="utf-8", newline="")
+        if key == "csv":
+            write_csv(df, text, chunk_rows)
+        else:
+            write_json(df, text, chunk_rows)
+        text.flush()
+        text.detach()
+        if compress:
+            target.close()  # Writes the gzip trailer; leaves the spool open
+
+    spool.seek(0)
+    return spool
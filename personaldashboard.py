@@ -14,6 +14,9 @@ import base64
 import json
 import logging
 
+from categories import CATEGORIES
+from records_frame import get_records_frame
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -26,27 +29,6 @@ st.set_page_config(
     initial_sidebar_state="collapsed",
 )
 
-# Categories data (this would be updated from a real data source)
-CATEGORIES = {
-    "Fables": "379d6867-57c1-4f57-b6ee-fb734313e538",
-    "Events": "7a184c41-1a49-4beb-a01a-d8dc01693b15",
-    "Music": "94979e9f-4895-4cd7-8601-ad53d8099bf4",
-    "Places": "96e5104f-c786-4928-b932-f59f5b4ddbf0",
-    "Food": "833299f6-ff1c-4fde-804f-6d3b3877c76e",
-    "People": "af8b7a27-00b4-4192-9fa6-90152a0640b2",
-    "Literature": "74b133e7-e496-4e9d-85b0-3bd5eb4c3871",
-    "Architecture": "94a13c20-8a03-45da-8829-10e2fe1e61a1",
-    "Skills": "6f6f5023-a99e-4a29-a44a-6d5acbf88085",
-    "Images": "4366cab1-031e-4b37-816b-311ee34461a9",
-    "Culture": "ab9fa2ce-1f83-4e91-b89d-cca18e8b301e",
-    "Flora & Fauna": "5f40610f-ae47-4472-944c-cb899128ebbf",
-    "Education": "784ddb92-9540-4ce1-b4e4-6c1b7b18849d",
-    "Vegetation": "2f831ae2-f0cd-4142-8646-68dd195dfba2",
-    "Dance": "3fa85f64-5717-4562-b3fc-2c963f66afa6",
-}
-
-# Reverse mapping for category ID to name
-CATEGORY_ID_TO_NAME = {v: k for k, v in CATEGORIES.items()}
 
 # Initialize session state
 def initialize_session_state():
@@ -193,7 +175,18 @@ def validate_records_data(records: List[Dict]) -> bool:
     return True
 
 # Data Processing Functions
-def summarize(records: List[Dict]) -> Optional[Dict]:
+def build_personal_frame(records: List[Dict]) -> pd.DataFrame:
+    """Parse the user's records once; `created_at` becomes the upload date"""
+    frame = get_records_frame(records)
+    df = frame[frame["uploaded_at"].notna()].copy()
+    df["created_at"] = df["date"].dt.date
+
+    if len(df) < len(frame):
+        logger.warning(f"Removed {len(frame) - len(df)} records with invalid dates")
+    return df
+
+
+def summarize(records: List[Dict], df: Optional[pd.DataFrame] = None) -> Optional[Dict]:
     """Summarize the records data with improved error handling"""
     if not records or not isinstance(records, list):
         st.warning("No valid records data to process")
@@ -203,20 +196,8 @@ def summarize(records: List[Dict]) -> Optional[Dict]:
         return None
     
     try:
-        df = pd.DataFrame(records)
-        
-        # Map category_id to category name
-        df["category"] = df["category_id"].map(CATEGORY_ID_TO_NAME).fillna("Unknown")
-        
-        # Handle date conversion with error handling
-        df["created_at"] = pd.to_datetime(df["created_at"], errors='coerce').dt.date
-        
-        # Remove rows with invalid dates
-        initial_count = len(df)
-        df = df.dropna(subset=['created_at'])
-        
-        if len(df) < initial_count:
-            logger.warning(f"Removed {initial_count - len(df)} records with invalid dates")
+        if df is None:
+            df = build_personal_frame(records)
         
         if df.empty:
             st.warning("No valid data after processing")
@@ -242,15 +223,16 @@ def summarize(records: List[Dict]) -> Optional[Dict]:
         st.error(f"Error processing data: {e}")
         return None
 
-def summarize_category(records: List[Dict], selected_category: str) -> Optional[Dict]:
+def summarize_category(
+    records: List[Dict], selected_category: str, df: Optional[pd.DataFrame] = None
+) -> Optional[Dict]:
     """Summarize records for a specific category"""
     if not records:
         return None
     
     try:
-        df = pd.DataFrame(records)
-        df["category"] = df["category_id"].map(CATEGORY_ID_TO_NAME).fillna("Unknown")
-        df["created_at"] = pd.to_datetime(df["created_at"], errors='coerce').dt.date
+        if df is None:
+            df = build_personal_frame(records)
         
         # Filter by selected category
         category_df = df[df["category"] == selected_category]
@@ -646,8 +628,11 @@ def show_dashboard():
     records = fetch_records(user_id, token)
     
     if records:
+        # Parse once; the overall and per-category summaries share the frame
+        records_df = build_personal_frame(records)
+
         # Overall summary
-        summary = summarize(records)
+        summary = summarize(records, records_df)
         
         if summary:
             # Display matplotlib summary plots
@@ -686,7 +671,7 @@ def show_dashboard():
             # Show category-specific analysis
             if selected_category:
                 with st.spinner(f"Processing data for {selected_category}..."):
-                    category_summary = summarize_category(records, selected_category)
+                    category_summary = summarize_category(records, selected_category, records_df)
                     
                 if category_summary:
                     st.subheader(f"📈 {selected_category} Category Report")
@@ -3,9 +3,41 @@
 import streamlit as st
 from asyncio.log import logger
 import time
-from typing import Dict,List, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional
 import requests
 
+from api_client import api_get
+from Auth import get_auth_scope
+from records_store import (
+    load_records_partitions,
+    load_records_store,
+    load_records_window,
+    read_records_store_meta,
+    record_months,
+    save_records_store,
+    update_records_store,
+    window_span,
+)
+from records_frame import get_user_records
+from shared_cache import dataset_cache
+
+# Pagination settings for the full-database crawl
+RECORDS_PAGE_LIMIT = 1000
+RECORDS_MAX_PAGES = 100  # Safety cap to prevent runaway crawls
+RECORDS_FETCH_CONCURRENCY = 6  # Pages requested in parallel
+SYNC_OVERLAP_PAGES = 1  # Already-known pages re-read before the tail on a delta sync
+USER_INDEX_MAX_AGE = 300  # Seconds the shared dataset may serve user lookups
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Connection problems, timeouts and 5xx responses; worth retrying later"""
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return error.response.status_code >= 500
+    return False
 
 
 def fetch_records_with_cache(
@@ -32,12 +64,11 @@ def fetch_records(user_id: str, token: str) -> List[Dict]:
         st.error("User ID and token are required")
         return []
 
-    url = f"https://backend2.swecha.org/api/v1/records/?user_id={user_id}&skip=0&limit=1000"
-    headers = {"Authorization": f"Bearer {token}", "Accept": "application/json"}
+    params = {"user_id": user_id, "skip": 0, "limit": 1000}
 
     try:
         with st.spinner("🔄 Fetching your records..."):
-            response = requests.get(url, headers=headers, timeout=30)
+            response = api_get("/records/", token, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
 
@@ -80,8 +111,7 @@ def fetch_any_user_records(query_user_id: str, token: str) -> List[Dict]:
         st.error("Please enter a valid User ID")
         return []
 
-    url = f"https://backend2.swecha.org/api/v1/records/?user_id={query_user_id.strip()}&skip=0&limit=1000"
-    headers = {"Authorization": f"Bearer {token}", "Accept": "application/json"}
+    params = {"user_id": query_user_id.strip(), "skip": 0, "limit": 1000}
 
     try:
         progress_bar = st.progress(0)
@@ -90,7 +120,7 @@ def fetch_any_user_records(query_user_id: str, token: str) -> List[Dict]:
         status_text.text(f"� Searching for user {query_user_id[:8]}...")
         progress_bar.progress(30)
 
-        response = requests.get(url, headers=headers, timeout=30)
+        response = api_get("/records/", token, params=params, timeout=30)
         progress_bar.progress(70)
         status_text.text("📊 Processing results...")
 
@@ -117,66 +147,141 @@ def fetch_any_user_records(query_user_id: str, token: str) -> List[Dict]:
         return []
 
 
-def fetch_all_records(token: str) -> List[Dict]:
-    """Enhanced function to fetch ALL records with proper pagination"""
+def lookup_user_records(
+    user_id: str, token: str, max_age: float = USER_INDEX_MAX_AGE
+) -> List[Dict]:
+    """A user's records, from the loaded full dataset when possible
+
+    Served from the per-user index of the shared records dataset when it
+    is loaded and at most `max_age` seconds old; otherwise, or when the
+    user has no records there, falls back to the API.
+    """
+    user_id = (user_id or "").strip()
+    if user_id and token:
+        cache_key = ("all_records", get_auth_scope(token))
+        all_records = dataset_cache.get(cache_key)
+        age = dataset_cache.age(cache_key)
+        if all_records and age is not None and age <= max_age:
+            user_records = get_user_records(all_records, user_id)
+            if user_records:
+                logger.info(f"Served {len(user_records)} records for {user_id} from the loaded dataset")
+                return user_records
+
+    return fetch_any_user_records(user_id, token)
+
+
+def fetch_records_page(
+    token: str, skip: int, limit: int = RECORDS_PAGE_LIMIT, timeout: int = 60
+) -> List[Dict]:
+    """Fetch a single page of records (no UI calls, safe to run in worker threads)"""
+    params = {"skip": skip, "limit": limit}
+    response = api_get("/records/", token, params=params, timeout=timeout)
+    response.raise_for_status()
+    data = response.json()
+
+    if not isinstance(data, list):
+        raise ValueError(f"Expected list, got {type(data)} at skip={skip}")
+
+    return data
+
+
+def iter_records_pages(
+    token: str, concurrency: int = RECORDS_FETCH_CONCURRENCY
+) -> Iterator[List[Dict]]:
+    """Yield the pages of the full records table in order as they arrive
+
+    Up to `concurrency` pages are in flight at once. Iteration stops after
+    an empty or short page, or after RECORDS_MAX_PAGES pages. No UI calls;
+    request and format errors propagate to the caller.
+    """
+    limit = RECORDS_PAGE_LIMIT
+    concurrency = max(1, int(concurrency))
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        # Sliding window of in-flight pages, kept in page order so pages
+        # are yielded exactly as a serial walk would yield them
+        in_flight = deque()
+        next_page = 0
+        try:
+            while next_page < min(concurrency, RECORDS_MAX_PAGES):
+                in_flight.append(
+                    executor.submit(fetch_records_page, token, next_page * limit, limit)
+                )
+                next_page += 1
+
+            while in_flight:
+                data = in_flight.popleft().result()
+
+                # If no data returned, we've reached the end
+                if not data:
+                    return
+
+                yield data
+
+                # If we got less than the limit, we've reached the end
+                if len(data) < limit:
+                    return
+
+                # Keep the window full
+                if next_page < RECORDS_MAX_PAGES:
+                    in_flight.append(
+                        executor.submit(fetch_records_page, token, next_page * limit, limit)
+                    )
+                    next_page += 1
+        finally:
+            # Pages past the end (or after the consumer stopped) are not needed
+            for future in in_flight:
+                future.cancel()
+
+
+def fetch_all_records(
+    token: str,
+    concurrency: int = RECORDS_FETCH_CONCURRENCY,
+    on_page: Optional[Callable[[List[Dict]], None]] = None,
+) -> List[Dict]:
+    """Fetch ALL records, requesting up to `concurrency` pages in parallel
+
+    `on_page` is called with each page as soon as it arrives, in page
+    order, so callers can render partial results during the crawl.
+    """
     if not token:
         st.error("Token is required")
         return []
     
     all_records = []
-    skip = 0
-    limit = 1000  # Keep reasonable batch size
-    page = 1
-    
-    headers = {"Authorization": f"Bearer {token}", "Accept": "application/json"}
+    limit = RECORDS_PAGE_LIMIT
+    page = 0
     
     try:
         # Create progress indicators
         progress_bar = st.progress(0)
         status_text = st.empty()
         
-        while True:
-            url = f"https://backend2.swecha.org/api/v1/records/?skip={skip}&limit={limit}"
-            
-            # Update progress
-            status_text.text(f"🔄 Loading records... Page {page} ({len(all_records)} records loaded)")
-            
-            response = requests.get(url, headers=headers, timeout=60)
-            response.raise_for_status()
-            data = response.json()
-            
-            if not isinstance(data, list):
-                st.warning("⚠️ Unexpected data format received")
-                break
-            
-            # If no data returned, we've reached the end
-            if not data:
-                logger.info(f"No more records found at page {page}")
-                break
-            
-            # Add records to our collection
-            all_records.extend(data)
-            logger.info(f"Fetched {len(data)} records from page {page}, total: {len(all_records)}")
-            
-            # If we got less than the limit, we've reached the end
-            if len(data) < limit:
-                logger.info(f"Reached end of records at page {page}")
-                break
-            
-            # Prepare for next iteration
-            skip += limit
-            page += 1
-            
-            # Update progress (estimate based on current data)
-            if len(all_records) > 0:
+        try:
+            for data in iter_records_pages(token, concurrency):
+                page += 1
+                
+                # Add records to our collection
+                all_records.extend(data)
+                logger.info(f"Fetched {len(data)} records from page {page}, total: {len(all_records)}")
+                
+                # Update progress
+                status_text.text(f"🔄 Loading records... Page {page} ({len(all_records)} records loaded)")
+                
+                # Update progress (estimate based on current data)
                 progress_percentage = min(0.95, (len(all_records) / (len(all_records) + 100)) * 100)
                 progress_bar.progress(progress_percentage / 100)
-            
-            # Safety check to prevent infinite loops
-            if page > 100:  # Reasonable limit
-                logger.warning(f"Stopped at page {page} to prevent infinite loop")
-                st.warning(f"⚠️ Stopped loading at page {page}. Contact admin if you need more records.")
-                break
+                
+                if on_page is not None:
+                    on_page(data)
+        except ValueError as e:
+            logger.warning(str(e))
+            st.warning("⚠️ Unexpected data format received")
+        
+        # Safety check to prevent infinite loops
+        if page >= RECORDS_MAX_PAGES and len(all_records) >= RECORDS_MAX_PAGES * limit:
+            logger.warning(f"Stopped at page {page} to prevent infinite loop")
+            st.warning(f"⚠️ Stopped loading at page {page}. Contact admin if you need more records.")
         
         # Complete progress
         progress_bar.progress(1.0)
@@ -201,14 +306,195 @@ def fetch_all_records(token: str) -> List[Dict]:
         return []
 
 
+def sync_records_store(
+    token: str,
+    full_refresh: bool = False,
+    on_page: Optional[Callable[[List[Dict]], None]] = None,
+) -> Optional[List[Dict]]:
+    """Bring the local records copy up to date, downloading only the new tail
+
+    The API pages records oldest-first, so new uploads land at the end.
+    Starting just before the tail of the local copy, pages are walked to
+    the end and merged by `uid` into the month partitions they belong to,
+    keeping the version with the newest `updated_at`; only those months
+    are read and rewritten. If the first page is empty or shares no `uid`
+    with the local copy the offsets have shifted (e.g. deletions) and a
+    full crawl is done instead. `on_page` only sees pages of a full crawl.
+
+    Returns the crawled records after a full crawl, None after a delta
+    sync (the records are then in the local copy). The local copy is only
+    served past a transient error; when the backend rejects the token (or
+    fails otherwise) nothing is returned.
+    """
+    scope = get_auth_scope(token)
+    meta = None if full_refresh else read_records_store_meta(scope)
+
+    if not meta or not meta.get("rows"):
+        records = fetch_all_records(token, on_page=on_page)
+        if records:
+            save_records_store(scope, records)
+        return records
+
+    watermark = meta.get("watermark", "")
+    months: Dict[str, Dict] = {}  # Loaded partitions, uid -> record
+    touched = set()
+
+    limit = RECORDS_PAGE_LIMIT
+    skip = max(0, (meta["rows"] // limit - SYNC_OVERLAP_PAGES) * limit)
+    new_count = 0
+    updated_count = 0
+
+    try:
+        with st.spinner("🔄 Syncing new records..."):
+            for page in range(1, RECORDS_MAX_PAGES + 1):
+                data = fetch_records_page(token, skip, limit)
+                page_months = record_months(data)
+
+                missing = set(page_months) - set(months)
+                for month, rows in load_records_partitions(scope, sorted(missing)).items():
+                    months[month] = {record.get("uid"): record for record in rows}
+
+                if page == 1 and skip > 0 and not any(
+                    record.get("uid") in months[month] for record, month in zip(data, page_months)
+                ):
+                    logger.warning("Record offsets shifted since last sync, running full refresh")
+                    return sync_records_store(token, full_refresh=True, on_page=on_page)
+
+                for record, month in zip(data, page_months):
+                    known = months[month]
+                    uid = record.get("uid")
+                    existing = known.get(uid)
+                    if existing is None:
+                        new_count += 1
+                    elif (record.get("updated_at") or "") > (existing.get("updated_at") or ""):
+                        updated_count += 1
+                    else:
+                        continue
+                    known[uid] = record
+                    touched.add(month)
+
+                if len(data) < limit:
+                    break
+                skip += limit
+
+    except Exception as e:
+        if not is_transient_error(e):
+            status = getattr(getattr(e, "response", None), "status_code", None)
+            logger.error(f"Incremental sync failed, not serving local copy: {e}")
+            if status in (401, 403):
+                st.error("🔐 Authentication failed. Please log in again.")
+                st.session_state.authenticated = False
+            else:
+                st.error(f"❌ Failed to sync records: {e}")
+            return []
+        logger.error(f"Incremental sync failed, serving local copy: {e}")
+        st.warning(f"⚠️ Could not sync new records, showing data as of {watermark}")
+        return None
+
+    if touched:
+        update_records_store(
+            scope, {month: list(months[month].values()) for month in touched}, watermark
+        )
+    logger.info(
+        f"Delta sync: {new_count} new, {updated_count} updated records since {watermark} "
+        f"({len(touched)} month partitions rewritten)"
+    )
+    st.success(f"✅ {meta['rows'] + new_count} records ({new_count} new, {updated_count} updated)")
+    return None
+
+
+def sync_records(
+    token: str,
+    full_refresh: bool = False,
+    on_page: Optional[Callable[[List[Dict]], None]] = None,
+) -> List[Dict]:
+    """Sync the local records copy (see `sync_records_store`) and return all records"""
+    if not token:
+        st.error("Token is required")
+        return []
+
+    records = sync_records_store(token, full_refresh=full_refresh, on_page=on_page)
+    if records is not None:
+        return records
+    store = load_records_store(get_auth_scope(token))
+    return store["records"] if store else []
+
+
+def fetch_records_window(
+    token: str,
+    start=None,
+    end=None,
+    use_cache: bool = True,
+    on_page: Optional[Callable[[List[Dict]], None]] = None,
+) -> Dict:
+    """Records that may fall in the UTC window [start, end), read by month partition
+
+    After a sync only the month partitions overlapping the window are read
+    from the local copy. Returns the records (still to be filtered to the
+    exact window), the row count of the whole copy and the `span` of time
+    the records cover (None when they are all records). When all records
+    are already cached they are served as they are. `on_page` is passed
+    through to a full crawl.
+    """
+    if not token:
+        st.error("Token is required")
+        return {}
+
+    scope = get_auth_scope(token)
+    all_key = ("all_records", scope)
+    span = window_span(start, end)
+    cache_key = ("records_window", scope, span)
+    if not use_cache:
+        dataset_cache.invalidate(lambda key: key in (all_key, cache_key))
+
+    all_records = dataset_cache.get(all_key)
+    if all_records:
+        return {"records": all_records, "rows": len(all_records), "span": None}
+
+    def load() -> Dict:
+        crawled = sync_records_store(token, on_page=on_page)
+        if crawled is not None:
+            if not crawled:
+                return {}
+            dataset_cache.set(all_key, crawled)
+            return {"records": crawled, "rows": len(crawled), "span": None}
+        return load_records_window(scope, start, end) or {}
+
+    return dataset_cache.get_or_load(cache_key, load)
+
+
+def fetch_all_records_with_cache(
+    token: str,
+    use_cache: bool = True,
+    full_refresh: bool = False,
+    on_page: Optional[Callable[[List[Dict]], None]] = None,
+) -> List[Dict]:
+    """Fetch all records through the process-wide cache shared by all sessions
+
+    Cache misses are served by an incremental sync against the local copy,
+    unless `full_refresh` asks for a complete re-download. `on_page` is
+    passed through to the crawl for progressive rendering.
+    """
+    if not token:
+        st.error("Token is required")
+        return []
+
+    cache_key = ("all_records", get_auth_scope(token))
+    if not use_cache or full_refresh:
+        dataset_cache.invalidate(lambda key: key == cache_key)
+
+    return dataset_cache.get_or_load(
+        cache_key, lambda: sync_records(token, full_refresh=full_refresh, on_page=on_page)
+    )
+
+
 def fetch_user_contributions(user_id: str, token: str) -> Optional[Dict]:
     """Fetch enhanced user contributions using the new API endpoint"""
     if not user_id or not token:
         st.error("User ID and token are required")
         return None
     
-    url = f"https://backend2.swecha.org/api/v1/users/{user_id}/contributions"
-    headers = {"Authorization": f"Bearer {token}", "Accept": "application/json"}
+    path = f"/users/{user_id}/contributions"
     
     try:
         progress_bar = st.progress(0)
@@ -216,7 +502,7 @@ def fetch_user_contributions(user_id: str, token: str) -> Optional[Dict]:
         status_text.text("🔄 Fetching user contributions...")
         progress_bar.progress(30)
         
-        response = requests.get(url, headers=headers, timeout=30)
+        response = api_get(path, token, timeout=30)
         progress_bar.progress(70)
         status_text.text("📊 Processing contributions data...")
         
@@ -263,10 +549,7 @@ def fetch_user_contributions_by_media_type(
         st.error(f"Invalid media type. Must be one of: {', '.join(valid_media_types)}")
         return []
 
-    url = (
-        f"https://backend2.swecha.org/api/v1/users/{user_id}/contributions/{media_type}"
-    )
-    headers = {"Authorization": f"Bearer {token}", "Accept": "application/json"}
+    path = f"/users/{user_id}/contributions/{media_type}"
 
     try:
         progress_bar = st.progress(0)
@@ -275,7 +558,7 @@ def fetch_user_contributions_by_media_type(
         status_text.text(f"🔄 Fetching your {media_type} contributions...")
         progress_bar.progress(30)
 
-        response = requests.get(url, headers=headers, timeout=30)
+        response = api_get(path, token, timeout=30)
         progress_bar.progress(70)
         status_text.text(f"📊 Processing {media_type} contributions...")
 
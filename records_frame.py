@@ -0,0 +1,261 @@
+# Canonical records frame: parsed once per dataset, shared by views and exports
+import calendar
+import json
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from categories import CATEGORY_ID_TO_NAME
+from shared_cache import SharedCache
+from snapshot_store import to_categoricals
+
+# Time filter options shown in the Database Overview
+TIME_FILTER_OVERALL = "📊 Overall"
+TIME_FILTER_24H = "📅 Last 24 Hours"
+TIME_FILTER_7D = "📆 Last 7 Days"
+TIME_FILTER_CUSTOM = "🗓️ Custom Range"
+TIME_FILTER_WINDOWS = {
+    TIME_FILTER_OVERALL: None,
+    TIME_FILTER_24H: timedelta(hours=24),
+    TIME_FILTER_7D: timedelta(days=7),
+}
+
+WEEKDAY_NAMES = list(calendar.day_name)  # Monday .. Sunday
+MONTH_NAMES = list(calendar.month_name)[1:]  # January .. December
+
+# Raw timestamp columns, parsed in typed exports
+TIMESTAMP_COLUMNS = ("created_at", "updated_at", "reviewed_at")
+
+# Frames built from record lists, keyed by the identity of the list
+_frame_cache = SharedCache(max_entries=8, ttl=600)
+
+
+def parse_record_timestamps(records: List[Dict]) -> pd.Series:
+    """Parse every record's upload time once into UTC (NaT if unparseable)
+
+    Uses the first of `timestamp`, `created_at` or `date` that is set; naive
+    timestamps are taken to be UTC, matching the API.
+    """
+    raw = pd.Series(
+        [
+            record.get("timestamp") or record.get("created_at") or record.get("date")
+            for record in records
+        ],
+        dtype=object,
+    )
+    return pd.to_datetime(raw, errors="coerce", utc=True, format="ISO8601")
+
+
+def _names_from_codes(codes: pd.Series, names: List[str]) -> pd.Categorical:
+    """Map integer codes (NaN allowed) to names without per-row string work"""
+    return pd.Categorical.from_codes(codes.fillna(-1).astype(int), categories=names)
+
+
+def dataset_fingerprint(df: pd.DataFrame) -> str:
+    """Cheap version id of a records frame, from its uids and update times"""
+    columns = [c for c in ("uid", "updated_at") if c in df.columns]
+    if not columns or df.empty:
+        return f"{len(df)}"
+    hashes = pd.util.hash_pandas_object(df[columns].astype(str), index=False).to_numpy()
+    return f"{len(df)}-{int(hashes.sum(dtype=np.uint64)):016x}"
+
+
+def build_records_frame(records: List[Dict]) -> pd.DataFrame:
+    """Normalize raw API records into the canonical typed frame
+
+    The raw API columns are kept as-is (exports use them); derived columns
+    are `category`, the parsed UTC upload time `uploaded_at`, and `date`
+    (UTC midnight), `hour`, `day_of_week`, `month` and `week`.
+
+    Rows are sorted by `uploaded_at` (unparseable times last) so time
+    ranges are binary searches (see `records_between`); the index holds
+    each row's position in `records`. `frame.attrs` records the raw column
+    names, the sort column and a dataset `version` fingerprint.
+    """
+    df = pd.DataFrame(records)
+    source_columns = list(df.columns)
+
+    if "category_id" in df.columns:
+        df["category"] = df["category_id"].map(CATEGORY_ID_TO_NAME).fillna("Unknown")
+    df["uploaded_at"] = parse_record_timestamps(records) if records else pd.Series(
+        [], dtype="datetime64[ns, UTC]"
+    )
+    df = df.take(np.argsort(df["uploaded_at"].values, kind="stable"))
+
+    created = df["uploaded_at"].dt
+    df["date"] = created.normalize()
+    df["hour"] = created.hour
+    df["day_of_week"] = _names_from_codes(created.dayofweek, WEEKDAY_NAMES)
+    df["month"] = _names_from_codes(created.month - 1, MONTH_NAMES)
+    df["week"] = created.isocalendar().week
+
+    df.attrs["source_columns"] = source_columns
+    df.attrs["sorted_by"] = "uploaded_at"
+    df.attrs["version"] = dataset_fingerprint(df)
+    return df
+
+
+def get_records_frame(records: List[Dict]) -> pd.DataFrame:
+    """Canonical frame for a list of records, built once per list
+
+    Datasets served from the shared cache are the same list object for
+    every session, so they share one frame as well.
+    """
+    key = id(records)
+    entry = _frame_cache.get(key)
+    if entry is not None and entry[0] is records:
+        return entry[1]
+
+    frame = build_records_frame(records)
+    _frame_cache.set(key, (records, frame))
+    return frame
+
+
+def build_user_index(frame: pd.DataFrame) -> Tuple[np.ndarray, Dict[str, Tuple[int, int]]]:
+    """Record positions sorted by user id, and user id -> (start, stop) into that order
+
+    Positions come from the frame index (positions in the records list);
+    each user's records keep their dataset order.
+    """
+    user_ids = frame["user_id"].astype(object).to_numpy() if "user_id" in frame.columns else np.array([])
+    rows = np.flatnonzero(pd.notna(user_ids))
+    positions = frame.index.to_numpy()[rows]
+    by_user = np.lexsort((positions, user_ids[rows].astype(str)))
+    order = positions[by_user]
+
+    sorted_ids = user_ids[rows][by_user]
+    if len(sorted_ids) == 0:
+        return order, {}
+    boundaries = np.flatnonzero(sorted_ids[1:] != sorted_ids[:-1]) + 1
+    starts = np.r_[0, boundaries]
+    stops = np.r_[boundaries, len(sorted_ids)]
+    return order, {sorted_ids[a]: (int(a), int(b)) for a, b in zip(starts, stops)}
+
+
+def get_user_records(records: List[Dict], user_id: str) -> List[Dict]:
+    """One user's records out of a full dataset, via a per-dataset user index"""
+    key = ("user_index", id(records))
+    entry = _frame_cache.get(key)
+    if entry is None or entry[0] is not records:
+        entry = (records, *build_user_index(get_records_frame(records)))
+        _frame_cache.set(key, entry)
+
+    _, order, ranges = entry
+    start, stop = ranges.get(user_id, (0, 0))
+    return [records[i] for i in order[start:stop]]
+
+
+def export_view(frame: pd.DataFrame) -> pd.DataFrame:
+    """The raw API columns of a canonical frame, as shown in exports"""
+    columns = frame.attrs.get("source_columns") or list(frame.columns)
+    return frame[[c for c in columns if c in frame.columns]]
+
+
+def typed_export_view(frame: pd.DataFrame) -> pd.DataFrame:
+    """Export columns with typed values, for the columnar export formats
+
+    Raw timestamps become UTC datetimes, low-cardinality columns (and the
+    derived `category`) categoricals, and nested values such as `location`
+    JSON strings.
+    """
+    view = export_view(frame).copy(deep=False)
+    if "category" in frame.columns and "category" not in view.columns:
+        view["category"] = frame["category"]
+
+    for column in TIMESTAMP_COLUMNS:
+        if column in view.columns:
+            view[column] = pd.to_datetime(view[column], errors="coerce", utc=True, format="ISO8601")
+
+    for column in view.columns:
+        if view[column].dtype == object:
+            nested = view[column].map(lambda value: isinstance(value, (dict, list)))
+            if nested.any():
+                view[column] = view[column].map(
+                    lambda value: json.dumps(value) if isinstance(value, (dict, list)) else value
+                )
+
+    view = to_categoricals(view)
+    if "category" in view.columns:
+        view["category"] = view["category"].astype("category")
+    return view
+
+
+def time_filter_bounds(
+    time_filter: str,
+    date_range: Optional[Tuple] = None,
+    now: Optional[datetime] = None,
+) -> Tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]:
+    """UTC (start, end) bounds for a time filter option; None means open"""
+    if time_filter == TIME_FILTER_CUSTOM and date_range:
+        start_date, end_date = date_range
+        start = pd.Timestamp(start_date).tz_localize("UTC")
+        end = pd.Timestamp(end_date).tz_localize("UTC") + pd.Timedelta(days=1)
+        return start, end
+
+    window = TIME_FILTER_WINDOWS.get(time_filter)
+    if window is None:
+        return None, None
+
+    now = pd.Timestamp(now) if now is not None else pd.Timestamp.now(tz="UTC")
+    if now.tzinfo is None:
+        now = now.tz_localize("UTC")
+    return now - window, None
+
+
+def time_window_positions(
+    timestamps: pd.Series,
+    start: Optional[pd.Timestamp] = None,
+    end: Optional[pd.Timestamp] = None,
+) -> np.ndarray:
+    """Positions of timestamps in [start, end); unparseable times never match"""
+    values = timestamps.values  # datetime64 in UTC, no per-element objects
+    mask = ~pd.isna(values)
+    if start is not None:
+        mask &= values >= start.to_datetime64()
+    if end is not None:
+        mask &= values < end.to_datetime64()
+    return np.flatnonzero(mask)
+
+
+def _utc_timestamp(value) -> pd.Timestamp:
+    value = pd.Timestamp(value)
+    return value.tz_localize("UTC") if value.tzinfo is None else value.tz_convert("UTC")
+
+
+def records_between(frame: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+    """Rows of a time-sorted frame uploaded in [start, end); None means open
+
+    Two binary searches over `uploaded_at` find the bounds and the result
+    is a positional slice of the frame (no copy). Naive bounds are UTC;
+    rows with unparseable times never match. Frames that are not sorted
+    (no `sorted_by` attr) fall back to a vectorized scan.
+    """
+    if frame.attrs.get("sorted_by") != "uploaded_at":
+        start = _utc_timestamp(start) if start is not None else None
+        end = _utc_timestamp(end) if end is not None else None
+        return frame.iloc[time_window_positions(frame["uploaded_at"], start, end)]
+
+    values = frame["uploaded_at"].values  # NaT sorts last
+    lo = 0 if start is None else np.searchsorted(values, _utc_timestamp(start).to_datetime64(), "left")
+    hi = np.searchsorted(
+        values, np.datetime64("NaT") if end is None else _utc_timestamp(end).to_datetime64(), "left"
+    )
+    return frame.iloc[lo:max(lo, hi)]
+
+
+def filter_frame_by_time(
+    frame: pd.DataFrame,
+    time_filter: str,
+    date_range: Optional[Tuple] = None,
+) -> pd.DataFrame:
+    """Rows of a canonical frame inside a time filter (vectorized, no re-parse)"""
+    start, end = time_filter_bounds(time_filter, date_range)
+    if start is None and end is None:
+        return frame
+
+    view = records_between(frame, start, end)
+    # Distinct windows of one dataset get distinct versions (summary cache keys)
+    view.attrs["version"] = f"{frame.attrs.get('version', '')}@{start}..{end}"
+    return view
@@ -0,0 +1,282 @@
+# Local materialized copy of the full records table, used for delta syncs
+#
+# The copy is partitioned by upload month (one snapshot file per "YYYY-MM"),
+# so syncs rewrite and time-windowed readers open only the months they touch.
+import hashlib
+import json
+from asyncio.log import logger
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from records_frame import parse_record_timestamps
+from snapshot_store import (
+    delete_snapshot,
+    load_snapshot_partitions,
+    load_snapshot_with_meta,
+    read_partitioned_meta,
+    save_snapshot_partitions,
+    snapshot_lock,
+)
+
+# Partition of records whose upload time cannot be parsed
+UNKNOWN_MONTH = "unknown"
+# Store metadata key listing the columns kept as JSON strings
+JSON_COLUMNS_KEY = "json_columns"
+
+
+def store_name(scope: str) -> str:
+    """Snapshot name of the local records copy for an auth scope
+
+    `scope` comes from `get_auth_scope`, which keeps a token's last
+    verified scope while the backend is unreachable, so an outage still
+    finds the existing copy.
+    """
+    scope_hash = hashlib.sha256(scope.encode()).hexdigest()[:16]
+    return f"records_store_{scope_hash}"
+
+
+def compute_watermark(records: List[Dict]) -> str:
+    """Latest created_at/updated_at seen in the records (ISO string)"""
+    watermark = ""
+    for record in records:
+        for field in ("updated_at", "created_at"):
+            value = record.get(field) or ""
+            if value > watermark:
+                watermark = value
+    return watermark
+
+
+def records_to_frame(records: List[Dict]) -> pd.DataFrame:
+    """Flatten API records into a frame that can be stored column-wise
+
+    Nested values (e.g. `location`) are kept as JSON strings; the names of
+    those columns are listed in `df.attrs["json_columns"]`.
+    """
+    df = pd.DataFrame(records)
+    json_columns = []
+    for column in df.columns:
+        if df[column].dtype == object:
+            nested = df[column].map(lambda v: isinstance(v, (dict, list)))
+            if nested.any():
+                df[column] = df[column].map(lambda v: json.dumps(v) if isinstance(v, (dict, list)) else v)
+                json_columns.append(column)
+    df.attrs[JSON_COLUMNS_KEY] = json_columns
+    return df
+
+
+def frame_to_records(df: pd.DataFrame, json_columns: Optional[List[str]] = None) -> List[Dict]:
+    """Turn a stored frame back into API-shaped record dicts (NaN -> None)
+
+    Values of `json_columns` (default: `df.attrs["json_columns"]`) are
+    decoded back into dicts and lists, as the API returns them.
+    """
+    if json_columns is None:
+        json_columns = df.attrs.get(JSON_COLUMNS_KEY, [])
+    df = df.astype(object)
+    df = df.where(df.notna(), None)
+    for column in json_columns:
+        if column in df.columns:
+            df[column] = df[column].map(lambda v: json.loads(v) if isinstance(v, str) else v)
+    return df.to_dict("records")
+
+
+def _json_columns(frames, meta: Optional[Dict] = None) -> List[str]:
+    """JSON-string columns of the frames, plus those already listed in `meta`"""
+    columns = set((meta or {}).get(JSON_COLUMNS_KEY, []))
+    for df in frames:
+        columns.update(df.attrs.get(JSON_COLUMNS_KEY, []))
+    return sorted(columns)
+
+
+def _stored_json_columns(df: pd.DataFrame) -> List[str]:
+    """JSON-string columns of a store written before they were recorded
+
+    Those stores encoded every dict/list value; a text column qualifies
+    when all of its values are JSON objects or arrays.
+    """
+    columns = []
+    for column in df.columns:
+        values = df[column].dropna()
+        if not pd.api.types.is_string_dtype(df[column].dtype) or values.empty:
+            continue
+        text = values.astype(str)
+        if not (text.str.startswith("{") | text.str.startswith("[")).all():
+            continue
+        try:
+            text.map(json.loads)
+        except ValueError:
+            continue
+        columns.append(column)
+    return columns
+
+
+def record_months(records: List[Dict]) -> List[str]:
+    """Upload month ("YYYY-MM", UTC) of each record; `UNKNOWN_MONTH` if unparseable"""
+    if not records:
+        return []
+    months = parse_record_timestamps(records).dt.strftime("%Y-%m")
+    return months.fillna(UNKNOWN_MONTH).tolist()
+
+
+def partition_records(records: List[Dict]) -> Dict[str, List[Dict]]:
+    """Records grouped by upload month"""
+    partitions: Dict[str, List[Dict]] = {}
+    for record, month in zip(records, record_months(records)):
+        partitions.setdefault(month, []).append(record)
+    return partitions
+
+
+def month_start(month: str) -> pd.Timestamp:
+    return pd.Timestamp(f"{month}-01", tz="UTC")
+
+
+def window_months(months: List[str], start=None, end=None) -> List[str]:
+    """The months overlapping the UTC window [start, end); None means open"""
+    start = pd.Timestamp(start) if start is not None else None
+    end = pd.Timestamp(end) if end is not None else None
+    selected = []
+    for month in months:
+        if month == UNKNOWN_MONTH:
+            continue
+        first = month_start(month)
+        if start is not None and first + pd.offsets.MonthBegin() <= start:
+            continue
+        if end is not None and first >= end:
+            continue
+        selected.append(month)
+    return selected
+
+
+def window_span(start=None, end=None) -> Tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]:
+    """Time range fully covered by loading the months of a window: whole months"""
+    start = pd.Timestamp(start).tz_convert("UTC") if start is not None else None
+    end = pd.Timestamp(end).tz_convert("UTC") if end is not None else None
+    lo = start.normalize().replace(day=1) if start is not None else None
+    hi = None
+    if end is not None:
+        hi = end.normalize().replace(day=1)
+        if hi < end:
+            hi += pd.offsets.MonthBegin()
+    return lo, hi
+
+
+def window_covers(span: Optional[Tuple], start=None, end=None) -> bool:
+    """Whether records loaded for `span` (None: everything) contain the window [start, end)"""
+    if span is None:
+        return True
+    lo, hi = span
+    if lo is not None and (start is None or pd.Timestamp(start) < lo):
+        return False
+    if hi is not None and (end is None or pd.Timestamp(end) > hi):
+        return False
+    return True
+
+
+def read_records_store_meta(scope: str) -> Optional[Dict]:
+    """Metadata (watermark, rows, partitions) of the local copy, or None
+
+    A copy saved as a single snapshot file by an earlier version is
+    converted to month partitions on first read.
+    """
+    name = store_name(scope)
+    meta = read_partitioned_meta(name)
+    if meta is not None:
+        return meta
+
+    with snapshot_lock(name):
+        meta = read_partitioned_meta(name)
+        if meta is not None:  # Converted by a concurrent reader
+            return meta
+        legacy = load_snapshot_with_meta(name)
+        if legacy is None:
+            return None
+        records = frame_to_records(legacy[1], _stored_json_columns(legacy[1]))
+        delete_snapshot(name)
+        logger.info(f"Converting local records copy {name} to month partitions")
+        return save_records_store(scope, records).get("meta")
+
+
+def load_records_partitions(scope: str, months: List[str]) -> Dict[str, List[Dict]]:
+    """Records of the given months (missing months are empty)"""
+    name = store_name(scope)
+    json_columns = (read_partitioned_meta(name) or {}).get(JSON_COLUMNS_KEY, [])
+    partitions = {}
+    for month in months:
+        df = load_snapshot_partitions(name, [month])
+        partitions[month] = (
+            frame_to_records(df, json_columns) if df is not None and not df.empty else []
+        )
+    return partitions
+
+
+def load_records_store(scope: str) -> Optional[Dict]:
+    """Load the local records copy, or None if there is none yet"""
+    meta = read_records_store_meta(scope)
+    if meta is None:
+        return None
+
+    df = load_snapshot_partitions(store_name(scope))
+    if df is None:
+        return None
+    return {
+        "watermark": meta.get("watermark", ""),
+        "records": frame_to_records(df, meta.get(JSON_COLUMNS_KEY, [])),
+    }
+
+
+def load_records_window(scope: str, start=None, end=None) -> Optional[Dict]:
+    """Records of the months overlapping [start, end), without reading other months
+
+    Returns the records (exact filtering is left to the caller), the row
+    count of the whole copy and the `span` the loaded months cover; None if
+    there is no local copy.
+    """
+    meta = read_records_store_meta(scope)
+    if meta is None:
+        return None
+
+    months = window_months(list(meta["partitions"]), start, end)
+    df = load_snapshot_partitions(store_name(scope), months)
+    if df is None:
+        return None
+    logger.info(f"Loaded {len(df)} records from {len(months)} of {len(meta['partitions'])} month partitions")
+    return {
+        "records": frame_to_records(df, meta.get(JSON_COLUMNS_KEY, [])) if not df.empty else [],
+        "rows": meta.get("rows", 0),
+        "span": window_span(start, end),
+        "watermark": meta.get("watermark", ""),
+    }
+
+
+def save_records_store(scope: str, records: List[Dict]) -> Dict:
+    """Persist the records copy with its watermark, one snapshot per upload month"""
+    store = {"watermark": compute_watermark(records), "records": records}
+    try:
+        frames = {
+            month: records_to_frame(rows) for month, rows in partition_records(records).items()
+        }
+        meta = {"watermark": store["watermark"], JSON_COLUMNS_KEY: _json_columns(frames.values())}
+        store["meta"] = save_snapshot_partitions(store_name(scope), frames, meta=meta, replace=True)
+    except Exception as e:
+        logger.warning(f"Could not save local records copy: {e}")
+    return store
+
+
+def update_records_store(scope: str, partitions: Dict[str, List[Dict]], watermark: str = "") -> Optional[Dict]:
+    """Rewrite only the given month partitions of the local copy
+
+    `partitions` hold the complete, merged records of each month; the new
+    watermark is the later of `watermark` and the newest time among them.
+    """
+    watermark = max(watermark, *(compute_watermark(rows) for rows in partitions.values()))
+    name = store_name(scope)
+    try:
+        frames = {month: records_to_frame(rows) for month, rows in partitions.items()}
+        with snapshot_lock(name):
+            json_columns = _json_columns(frames.values(), read_partitioned_meta(name))
+            meta = {"watermark": watermark, JSON_COLUMNS_KEY: json_columns}
+            return save_snapshot_partitions(name, frames, meta=meta)
+    except Exception as e:
+        logger.warning(f"Could not update local records copy: {e}")
+        return None
@@ -0,0 +1,104 @@
+# Process-wide cache shared by every Streamlit session on this server
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional
+
+
+class SharedCache:
+    """Thread-safe TTL cache with LRU eviction and single-flight loading"""
+
+    def __init__(self, max_entries: int = 16, ttl: float = 600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Per-key load locks with their number of holders and waiters
+        self._key_locks: Dict[Hashable, List] = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return a fresh cached value, or None if missing/expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() >= entry["expires_at"]:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry["data"]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store a value, evicting the least recently used entries if full"""
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            self._entries[key] = {
+                "data": value,
+                "timestamp": time.time(),
+                "expires_at": time.time() + ttl,
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_load(
+        self, key: Hashable, loader: Callable[[], Any], ttl: Optional[float] = None
+    ) -> Any:
+        """Return the cached value or run `loader` once, even under concurrency
+
+        Concurrent callers asking for the same key wait for the first
+        caller's load instead of starting their own. Empty results are not
+        cached so a failed fetch is retried on the next call.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._key_lock(key):
+            value = self.get(key)
+            if value is not None:
+                return value
+
+            value = loader()
+            if not _is_empty(value):
+                self.set(key, value, ttl)
+            return value
+
+    def invalidate(self, predicate: Optional[Callable[[Hashable], bool]] = None):
+        """Drop every entry, or only the entries whose key matches `predicate`"""
+        with self._lock:
+            for key in list(self._entries):
+                if predicate is None or predicate(key):
+                    del self._entries[key]
+
+    def age(self, key: Hashable) -> Optional[float]:
+        """Seconds since the entry was stored, or None if not cached"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return None if entry is None else time.time() - entry["timestamp"]
+
+    @contextmanager
+    def _key_lock(self, key: Hashable) -> Iterator[None]:
+        """Hold the load lock of `key`; it is dropped once no one holds or waits for it"""
+        with self._lock:
+            slot = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            slot[1] += 1
+        try:
+            with slot[0]:
+                yield
+        finally:
+            with self._lock:
+                slot[1] -= 1
+                if slot[1] == 0:
+                    del self._key_locks[key]
+
+
+def _is_empty(value: Any) -> bool:
+    """None or a zero-length value (works for lists, dicts and DataFrames)"""
+    return value is None or (hasattr(value, "__len__") and len(value) == 0)
+
+
+# Full-dataset cache (records, users); entries are keyed by (dataset, auth scope)
+DATASET_CACHE_TTL = 600  # 10 minutes
+dataset_cache = SharedCache(max_entries=16, ttl=DATASET_CACHE_TTL)
@@ -0,0 +1,261 @@
+# Typed columnar snapshots of the CSV datasets and fetched API data
+import json
+import os
+import tempfile
+import threading
+from asyncio.log import logger
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+
+    PARQUET_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the deployment
+    PARQUET_AVAILABLE = False
+
+SNAPSHOT_DIR = "data/snapshots"
+SNAPSHOT_EXTENSION = ".parquet" if PARQUET_AVAILABLE else ".pkl"
+
+# Low-cardinality columns stored as pandas categoricals
+CATEGORICAL_COLUMNS = ("media_type", "status", "category_id", "College")
+
+# One lock per snapshot name, held while its data and metadata are written
+# or read together
+_snapshot_locks: Dict[str, threading.RLock] = {}
+_snapshot_locks_guard = threading.Lock()
+
+
+def snapshot_path(name: str) -> str:
+    """Path of the data file for a named snapshot"""
+    return os.path.join(SNAPSHOT_DIR, f"{name}{SNAPSHOT_EXTENSION}")
+
+
+def _meta_path(name: str) -> str:
+    return os.path.join(SNAPSHOT_DIR, f"{name}.meta.json")
+
+
+@contextmanager
+def snapshot_lock(name: str) -> Iterator[None]:
+    """Serialize writers (and paired meta/data readers) of one snapshot
+
+    Reentrant, so a group of snapshots can be written or read under the
+    lock of the one that marks the group complete.
+    """
+    with _snapshot_locks_guard:
+        lock = _snapshot_locks.setdefault(name, threading.RLock())
+    with lock:
+        yield
+
+
+def source_signature(path: str) -> Dict:
+    """Identify a source file version by path, size and modification time"""
+    stat = os.stat(path)
+    return {"path": os.path.abspath(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def to_categoricals(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert the known low-cardinality columns to categorical dtype"""
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype("category")
+    return df
+
+
+def read_snapshot_meta(name: str) -> Optional[Dict]:
+    """Metadata stored alongside a snapshot, or None if there is no snapshot"""
+    path = _meta_path(name)
+    if not os.path.exists(path) or not os.path.exists(snapshot_path(name)):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def replace_atomically(path: str, write: Callable[[str], None]):
+    """Write through a unique temp file next to `path`, then move it into place"""
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path), prefix=f"{os.path.basename(path)}.", suffix=".tmp"
+    )
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _write_frame(df: pd.DataFrame, path: str):
+    if PARQUET_AVAILABLE:
+        replace_atomically(path, lambda tmp_path: df.to_parquet(tmp_path, index=False))
+    else:
+        replace_atomically(path, df.to_pickle)
+
+
+def _write_meta(name: str, meta: Dict):
+    def write(tmp_path: str):
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    replace_atomically(_meta_path(name), write)
+
+
+def _read_frame(path: str, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+    if not os.path.exists(path):
+        return None
+
+    try:
+        if PARQUET_AVAILABLE:
+            return pd.read_parquet(path, columns=columns, memory_map=True)
+        df = pd.read_pickle(path)
+        return df[columns] if columns else df
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable snapshot {path}: {e}")
+        return None
+
+
+def save_snapshot(name: str, df: pd.DataFrame, meta: Optional[Dict] = None) -> str:
+    """Write a DataFrame snapshot plus its metadata (atomic replace)"""
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    df = to_categoricals(df)
+
+    path = snapshot_path(name)
+    with snapshot_lock(name):
+        _write_frame(df, path)
+        _write_meta(name, {**(meta or {}), "rows": len(df)})
+
+    logger.info(f"Saved snapshot {path} ({len(df)} rows)")
+    return path
+
+
+def load_snapshot(name: str, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+    """Load a snapshot, reading only `columns` when given (memory-mapped parquet)"""
+    return _read_frame(snapshot_path(name), columns)
+
+
+def load_snapshot_with_meta(
+    name: str, columns: Optional[List[str]] = None
+) -> Optional[Tuple[Dict, pd.DataFrame]]:
+    """A snapshot's metadata and data, read as one consistent pair (or None)"""
+    with snapshot_lock(name):
+        meta = read_snapshot_meta(name)
+        df = load_snapshot(name, columns) if meta is not None else None
+    return None if df is None else (meta, df)
+
+
+def delete_snapshot(name: str):
+    """Remove a single-file snapshot and its metadata"""
+    with snapshot_lock(name):
+        for path in (snapshot_path(name), _meta_path(name)):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+# Partitioned snapshots: one file per partition key in a directory named
+# after the snapshot; the metadata lists the partitions and their row counts
+
+def partition_path(name: str, key: str) -> str:
+    """Path of one partition file of a partitioned snapshot"""
+    return os.path.join(SNAPSHOT_DIR, name, f"{key}{SNAPSHOT_EXTENSION}")
+
+
+def read_partitioned_meta(name: str) -> Optional[Dict]:
+    """Metadata of a partitioned snapshot, or None if there is none"""
+    try:
+        with open(_meta_path(name), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if isinstance(meta.get("partitions"), dict) else None
+
+
+def save_snapshot_partitions(
+    name: str,
+    partitions: Dict[str, pd.DataFrame],
+    meta: Optional[Dict] = None,
+    replace: bool = False,
+) -> Dict:
+    """Write the given partitions of a snapshot and update its metadata
+
+    Only the partitions passed are rewritten; other existing partitions
+    are kept, or deleted when `replace` is set. Returns the new metadata.
+    """
+    os.makedirs(os.path.join(SNAPSHOT_DIR, name), exist_ok=True)
+    with snapshot_lock(name):
+        existing = (read_partitioned_meta(name) or {}).get("partitions", {})
+        listed = {} if replace else dict(existing)
+
+        for key, df in partitions.items():
+            _write_frame(to_categoricals(df), partition_path(name, key))
+            listed[key] = {"rows": len(df)}
+
+        for key in set(existing) - set(listed):
+            if os.path.exists(partition_path(name, key)):
+                os.remove(partition_path(name, key))
+
+        meta = {
+            **(meta or {}),
+            "partitions": dict(sorted(listed.items())),
+            "rows": sum(info["rows"] for info in listed.values()),
+        }
+        _write_meta(name, meta)
+
+    logger.info(f"Saved {len(partitions)} of {len(listed)} partitions of snapshot {name} ({meta['rows']} rows)")
+    return meta
+
+
+def load_snapshot_partitions(
+    name: str,
+    keys: Optional[List[str]] = None,
+    columns: Optional[List[str]] = None,
+) -> Optional[pd.DataFrame]:
+    """Rows of the listed partitions (all when `keys` is None), or None if unreadable
+
+    Partitions that are not in the snapshot are skipped without reading.
+    """
+    frames = []
+    with snapshot_lock(name):
+        meta = read_partitioned_meta(name)
+        if meta is None:
+            return None
+
+        listed = meta["partitions"]
+        keys = list(listed) if keys is None else [key for key in keys if key in listed]
+        for key in keys:
+            df = _read_frame(partition_path(name, key), columns)
+            if df is None:
+                return None
+            # Categories differ between partitions; plain values concatenate cleanly
+            frames.append(df.astype({c: object for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)}))
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True)
+
+
+def load_csv_snapshot(csv_path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Read a CSV dataset through its columnar snapshot
+
+    The snapshot is rebuilt from the CSV whenever the CSV's size or
+    modification time differs from the one recorded at snapshot time.
+    """
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    signature = source_signature(csv_path)
+
+    stored = load_snapshot_with_meta(name, columns)
+    if stored is not None and stored[0].get("source") == signature:
+        return stored[1]
+
+    df = pd.read_csv(csv_path)
+    try:
+        save_snapshot(name, df, meta={"source": signature})
+    except Exception as e:
+        logger.warning(f"Could not write snapshot for {csv_path}: {e}")
+        df = to_categoricals(df)
+
+    return df[columns] if columns else df
@@ -0,0 +1,479 @@
+# Summary engine: every count/size aggregate comes from a few grouped passes
+from collections import Counter
+from typing import Dict, Hashable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from categories import CATEGORY_ID_TO_NAME
+from records_frame import (
+    MONTH_NAMES,
+    WEEKDAY_NAMES,
+    dataset_fingerprint,
+    parse_record_timestamps,
+    records_between,
+)
+from shared_cache import SharedCache
+from time_index import DailyTimeIndex, growth_percent
+
+# Computed summaries, keyed by dataset version + filters (LRU)
+SUMMARY_CACHE_TTL = 1800  # 30 minutes
+summary_cache = SharedCache(max_entries=32, ttl=SUMMARY_CACHE_TTL)
+
+
+def calculate_growth_rate(series: pd.Series) -> float:
+    """Calculate growth rate for time series data"""
+    if len(series) < 2:
+        return 0.0
+
+    return growth_percent(series.iloc[-1], series.iloc[-2])
+
+
+def calculate_storage_growth_rate(
+    file_size_by_date: Dict, period: str = "weekly"
+) -> float:
+    """Calculate storage growth rate over a specified period"""
+    if not file_size_by_date or len(file_size_by_date) < 2:
+        return 0.0
+
+    sizes = pd.Series(file_size_by_date, dtype="float64")
+    sizes.index = pd.to_datetime(sizes.index)
+    uploads = pd.Series(1, index=sizes.index)
+    return DailyTimeIndex(uploads, sizes).growth_rate(period, "bytes")
+
+
+def _by_name(counts: pd.Series, names: List[str], offset: int = 0) -> pd.Series:
+    """Relabel counts grouped by an integer code with names, sorted by name
+
+    Matches the alphabetical order a groupby on the name column produces.
+    """
+    counts = counts.copy()
+    counts.index = [names[int(code) - offset] for code in counts.index]
+    return counts.sort_index()
+
+
+def filter_summary_frame(df: pd.DataFrame, filters: Dict = None) -> pd.DataFrame:
+    """Rows of a records frame (or rollup cube) matching the summary filters
+
+    On a time-sorted records frame the date range is a binary search.
+    """
+    if not filters:
+        return df
+    sorted_frame = df.attrs.get("sorted_by") == "uploaded_at" and "uploaded_at" in df.columns
+    if filters.get("date_range") and sorted_frame:
+        start_date, end_date = filters["date_range"]
+        df = records_between(df, pd.Timestamp(start_date), pd.Timestamp(end_date) + pd.Timedelta(days=1))
+    elif filters.get("date_range"):
+        start_date, end_date = filters["date_range"]
+        tz = df["date"].dt.tz
+        start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+        if tz is not None:
+            start, end = start.tz_localize(tz), end.tz_localize(tz)
+        df = df[(df["date"] >= start) & (df["date"] <= end)]
+    if filters.get("categories"):
+        df = df[df["category"].isin(filters["categories"])]
+    if filters.get("media_types"):
+        df = df[df["media_type"].isin(filters["media_types"])]
+    if filters.get("status"):
+        df = df[df["status"].isin(filters["status"])]
+    return df
+
+
+def _assemble_summary(
+    total_records: int,
+    total_users: int,
+    media_counts: pd.Series,
+    status_counts: pd.Series,
+    category_counts: pd.Series,
+    by_date: pd.DataFrame,
+    uploads_per_hour: pd.Series,
+    total_file_size: float,
+    media_sizes: Optional[pd.DataFrame],
+    category_sizes: Optional[pd.Series],
+    category_diversity: int,
+    media_diversity: int,
+) -> Dict:
+    """The summary dict, from counts per dimension
+
+    `by_date` has a `records` column (and `size` when sizes are known) per
+    day-normalised timestamp; `media_sizes` has `sum` and `size` (record
+    count) columns per media type. Both are None without sizes.
+
+    Every time series and growth rate comes from a `DailyTimeIndex` over
+    `by_date`, returned as `time_index` for date range queries.
+    """
+    time_index = DailyTimeIndex(
+        by_date["records"], by_date["size"] if media_sizes is not None else None
+    )
+    daily = time_index.daily()
+    days = daily.index
+    uploads_per_weekday = _by_name(daily.groupby(days.dayofweek).sum(), WEEKDAY_NAMES)
+    uploads_per_month = _by_name(daily.groupby(days.month).sum(), MONTH_NAMES, offset=1)
+    uploads_per_week = daily.groupby(days.isocalendar().week.array).sum()
+    uploads_per_week.index.name = "week"
+
+    uploads_per_day = daily.copy()
+    uploads_per_day.index = days.date
+    uploads_per_day.index.name = "date"
+
+    # Calculate file size statistics
+    avg_file_size = 0
+    file_size_by_media_type = {}
+    avg_file_size_by_media_type = {}
+    file_size_by_category = {}
+    file_size_by_date = {}
+
+    if media_sizes is not None:
+        avg_file_size = total_file_size / total_records
+
+        file_size_by_media_type = media_sizes["sum"].to_dict()
+        avg_file_size_by_media_type = (media_sizes["sum"] / media_sizes["size"]).to_dict()
+        file_size_by_category = category_sizes.to_dict()
+        file_size_by_date = dict(zip(days.date, time_index.daily("bytes").values))
+
+    unique_dates = len(uploads_per_day)
+
+    return {
+        "total_records": total_records,
+        "total_users": total_users,
+        "unique_dates": unique_dates,
+        "date_range": (uploads_per_day.index.min(), uploads_per_day.index.max()),
+        "avg_daily_uploads": total_records / max(unique_dates, 1),
+        "media_type": media_counts,
+        "status": status_counts,
+        "category": category_counts,
+        "uploads_per_day": uploads_per_day,
+        "uploads_per_hour": uploads_per_hour,
+        "uploads_per_weekday": uploads_per_weekday,
+        "uploads_per_month": uploads_per_month,
+        "uploads_per_week": uploads_per_week,
+        "peak_upload_day": uploads_per_day.idxmax(),
+        "peak_upload_count": uploads_per_day.max(),
+        "most_active_hour": uploads_per_hour.idxmax(),
+        "most_active_weekday": uploads_per_weekday.idxmax(),
+        "category_diversity": category_diversity,
+        "media_diversity": media_diversity,
+        "weekly_growth": time_index.growth_rate("weekly"),
+        "monthly_growth": time_index.growth_rate("monthly"),
+        # Individual media type counts
+        "images_count": media_counts.get("image", 0),
+        "videos_count": media_counts.get("video", 0),
+        "texts_count": media_counts.get("text", 0),
+        "audios_count": media_counts.get("audio", 0),
+        # File size statistics
+        "total_file_size": total_file_size,
+        "avg_file_size": avg_file_size,
+        "file_size_by_media_type": file_size_by_media_type,
+        "avg_file_size_by_media_type": avg_file_size_by_media_type,
+        "file_size_by_category": file_size_by_category,
+        "file_size_by_date": file_size_by_date,
+        # Storage growth metrics
+        "storage_growth_weekly": time_index.growth_rate("weekly", "bytes"),
+        "storage_growth_monthly": time_index.growth_rate("monthly", "bytes"),
+        "time_index": time_index,
+    }
+
+
+def summarize_frame(df: pd.DataFrame, filters: Dict = None) -> Optional[Dict]:
+    """Compute the dashboard summary for a canonical records frame
+
+    The `date` column holds day-normalised timestamps; date keys in the
+    returned summary are plain `datetime.date` objects.
+    """
+    df = filter_summary_frame(df, filters)
+    if df.empty:
+        return None
+
+    has_size = "size" in df.columns
+    if has_size:
+        # Convert size to numeric, handling any non-numeric values
+        df = df.assign(size=pd.to_numeric(df["size"], errors="coerce").fillna(0))
+
+    # One pass per time grain; the day grain also carries the size totals
+    by_date = df.groupby("date")
+    by_date = by_date.agg(records=("date", "size"), size=("size", "sum")) if has_size else (
+        by_date.size().to_frame("records")
+    )
+
+    media_sizes = category_sizes = None
+    if has_size:
+        media_sizes = df.groupby("media_type", sort=False)["size"].agg(["sum", "size"])
+        category_sizes = df.groupby("category", sort=False)["size"].sum()
+
+    summary = _assemble_summary(
+        total_records=len(df),
+        total_users=df["user_id"].nunique() if "user_id" in df.columns else 0,
+        media_counts=df["media_type"].value_counts(),
+        status_counts=df["status"].value_counts(),
+        category_counts=df["category"].value_counts(),
+        by_date=by_date,
+        uploads_per_hour=df.groupby("hour").size(),
+        total_file_size=df["size"].sum() if has_size else 0,
+        media_sizes=media_sizes,
+        category_sizes=category_sizes,
+        category_diversity=df["category"].nunique(dropna=False),
+        media_diversity=df["media_type"].nunique(dropna=False),
+    )
+    summary["uploads_per_user"] = (
+        df.groupby("user_id").size() if "user_id" in df.columns else pd.Series(dtype="int64")
+    )
+    summary["df"] = df
+    return summary
+
+
+# Rollup cube grain; upload hours are kept as 24 count columns per cell
+CUBE_DIMENSIONS = ["date", "category", "media_type", "status"]
+HOURS_PER_DAY = 24
+
+
+class RollupCube:
+    """Record counts and size sums pre-aggregated for one dataset version
+
+    `cells` holds one row per day x category x media_type x status
+    combination with its record count and size sum; `hourly` the record
+    counts of each cell per upload hour. For distinct users and the
+    leaderboard, every (cell, user) pair with uploads is kept as integer
+    codes. Any filter combination is answered by selecting cells and
+    summing, so the cost depends on the number of cells, not records.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.version = df.attrs.get("version") or dataset_fingerprint(df)
+        self.has_size = "size" in df.columns
+        self.hour_dtype = df["hour"].dtype
+        size = pd.to_numeric(df["size"], errors="coerce").fillna(0) if self.has_size else 0.0
+        facts = df.assign(records=1, size=size)
+
+        grouped = facts.groupby(CUBE_DIMENSIONS, dropna=False, sort=False, observed=True)
+        self.cells = grouped[["records", "size"]].sum().reset_index()
+        self.cells.attrs = {}  # Not a records frame: no version or sort order
+        cell_codes = grouped.ngroup().to_numpy()
+
+        hours = df["hour"].to_numpy(dtype=float)
+        known = ~np.isnan(hours)
+        self.hourly = np.bincount(
+            cell_codes[known] * HOURS_PER_DAY + hours[known].astype(np.int64),
+            minlength=len(self.cells) * HOURS_PER_DAY,
+        ).reshape(-1, HOURS_PER_DAY)
+
+        # (cell, user) pairs; records without a user id count for no user
+        user_codes, self.user_ids = pd.factorize(
+            df["user_id"] if "user_id" in df.columns else pd.Series([None] * len(df))
+        )
+        has_user = user_codes >= 0
+        pairs, self.pair_records = np.unique(
+            cell_codes[has_user].astype(np.int64) * max(len(self.user_ids), 1) + user_codes[has_user],
+            return_counts=True,
+        )
+        self.pair_cells, self.pair_users = np.divmod(pairs, max(len(self.user_ids), 1))
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def summarize(self, filters: Dict = None) -> Optional[Dict]:
+        """The `summarize_frame` summary for these filters, from the cube cells
+
+        The filtered frame (`df`) is not known to the cube;
+        `cached_summarize_frame` adds it.
+        """
+        cells = filter_summary_frame(self.cells, filters)
+        if cells.empty:
+            return None
+
+        positions = cells.index.to_numpy()
+        records = cells["records"]
+        by_date = cells.groupby("date")[["records", "size"] if self.has_size else ["records"]].sum()
+
+        hour_counts = self.hourly[positions].sum(axis=0)
+        observed_hours = np.flatnonzero(hour_counts)
+        uploads_per_hour = pd.Series(
+            hour_counts[observed_hours],
+            index=pd.Index(observed_hours, dtype=self.hour_dtype, name="hour"),
+        )
+
+        media_sizes = category_sizes = None
+        if self.has_size:
+            media_sizes = cells.groupby("media_type", sort=False)[["size", "records"]].sum()
+            media_sizes.columns = ["sum", "size"]
+            category_sizes = cells.groupby("category", sort=False)["size"].sum()
+
+        selected = np.zeros(len(self.cells), dtype=bool)
+        selected[positions] = True
+        in_filter = selected[self.pair_cells]
+        user_counts = np.bincount(
+            self.pair_users[in_filter],
+            weights=self.pair_records[in_filter],
+            minlength=len(self.user_ids),
+        ).astype(np.int64)
+        active = np.flatnonzero(user_counts)
+        uploads_per_user = pd.Series(
+            user_counts[active], index=pd.Index(self.user_ids[active], name="user_id")
+        ).sort_index()
+
+        summary = _assemble_summary(
+            total_records=int(records.sum()),
+            total_users=len(active),
+            media_counts=self._counts(cells, "media_type"),
+            status_counts=self._counts(cells, "status"),
+            category_counts=self._counts(cells, "category"),
+            by_date=by_date,
+            uploads_per_hour=uploads_per_hour,
+            total_file_size=cells["size"].sum() if self.has_size else 0,
+            media_sizes=media_sizes,
+            category_sizes=category_sizes,
+            category_diversity=cells["category"].nunique(dropna=False),
+            media_diversity=cells["media_type"].nunique(dropna=False),
+        )
+        summary["uploads_per_user"] = uploads_per_user
+        return summary
+
+    @staticmethod
+    def _counts(cells: pd.DataFrame, column: str) -> pd.Series:
+        """Record counts per value, ordered like `value_counts`"""
+        counts = cells.groupby(column, sort=False)["records"].sum()
+        return counts.sort_values(ascending=False, kind="stable").rename("count")
+
+
+def _filter_key(filters: Optional[Dict]) -> Hashable:
+    """Hashable, order-independent form of the summary filters"""
+    filters = filters or {}
+    date_range = filters.get("date_range")
+    return (
+        tuple(str(d) for d in date_range) if date_range else None,
+        tuple(sorted(filters.get("categories") or [])),
+        tuple(sorted(filters.get("media_types") or [])),
+        tuple(sorted(filters.get("status") or [])),
+    )
+
+
+def summary_cache_key(df: pd.DataFrame, filters: Dict = None) -> Hashable:
+    """Cache key of a summary: the frame's dataset version plus the filters"""
+    version = df.attrs.get("version") or dataset_fingerprint(df)
+    return (version, len(df), _filter_key(filters))
+
+
+def get_rollup_cube(df: pd.DataFrame) -> RollupCube:
+    """The rollup cube of a records frame, built once per dataset version"""
+    version = df.attrs.get("version") or dataset_fingerprint(df)
+    return summary_cache.get_or_load(("cube", version, len(df)), lambda: RollupCube(df))
+
+
+def cached_summarize_frame(df: pd.DataFrame, filters: Dict = None) -> Optional[Dict]:
+    """Summary of a records frame, answered from its rollup cube
+
+    Both the cube and each filter combination's summary are memoized per
+    dataset version; treat the returned dict as read-only since it is shared.
+    Like `summarize_frame`, the summary carries the filtered frame as `df`.
+    """
+    if df.empty:
+        return None
+
+    def load() -> Optional[Dict]:
+        summary = get_rollup_cube(df).summarize(filters)
+        if summary is not None:
+            summary["df"] = filter_summary_frame(df, filters)
+        return summary
+
+    return summary_cache.get_or_load(summary_cache_key(df, filters), load)
+
+
+SUMMARY_BREAKDOWNS = ("media_type", "status", "category")
+
+
+def summary_table(summary: Dict) -> pd.DataFrame:
+    """A summary as one long typed table, for the columnar export formats
+
+    Columns are `breakdown` (categorical), `key`, `date` (UTC, set on the
+    `uploads_per_day` rows only) and `count`; the `total` breakdown holds
+    the record and user totals.
+    """
+    parts = [pd.DataFrame({
+        "breakdown": "total",
+        "key": ["records", "users"],
+        "count": [summary.get("total_records", 0), summary.get("total_users", 0)],
+    })]
+    for breakdown in SUMMARY_BREAKDOWNS:
+        counts = pd.Series(summary.get(breakdown, {}), dtype="int64")
+        parts.append(pd.DataFrame({
+            "breakdown": breakdown, "key": counts.index.astype(str), "count": counts.values,
+        }))
+
+    daily = pd.Series(summary.get("uploads_per_day", {}), dtype="int64")
+    parts.append(pd.DataFrame({
+        "breakdown": "uploads_per_day",
+        "date": pd.to_datetime(pd.Series(daily.index, dtype=object), utc=True),
+        "count": daily.values,
+    }))
+
+    table = pd.concat(parts, ignore_index=True)[["breakdown", "key", "date", "count"]]
+    table["breakdown"] = table["breakdown"].astype("category")
+    table["date"] = pd.to_datetime(table["date"], utc=True)
+    table["count"] = table["count"].astype("int64")
+    return table
+
+
+class RunningSummary:
+    """Headline aggregates updated page by page while records stream in"""
+
+    def __init__(self):
+        self.pages = 0
+        self.total_records = 0
+        self.total_file_size = 0.0
+        self.users = set()
+        self.media_type = Counter()
+        self.status = Counter()
+        self.category = Counter()
+        self.uploads_per_day = Counter()
+        self.file_size_by_date = Counter()
+
+    def update(self, page: List[Dict]):
+        """Fold one page of raw API records into the running totals"""
+        if not page:
+            return
+
+        df = pd.DataFrame(page)
+        self.pages += 1
+        self.total_records += len(df)
+
+        if "user_id" in df.columns:
+            self.users.update(df["user_id"].dropna().unique())
+        for column, counter in (("media_type", self.media_type), ("status", self.status)):
+            if column in df.columns:
+                counter.update(df[column].value_counts().to_dict())
+        if "category_id" in df.columns:
+            categories = df["category_id"].map(CATEGORY_ID_TO_NAME).fillna("Unknown")
+            self.category.update(categories.value_counts().to_dict())
+
+        sizes = (
+            pd.to_numeric(df["size"], errors="coerce").fillna(0)
+            if "size" in df.columns
+            else pd.Series(0.0, index=df.index)
+        )
+        self.total_file_size += float(sizes.sum())
+
+        dates = parse_record_timestamps(page).dt.date
+        self.uploads_per_day.update(dates.value_counts().to_dict())
+        self.file_size_by_date.update(sizes.groupby(dates.values).sum().to_dict())
+
+    def snapshot(self) -> Dict:
+        """Current totals, keyed like the full summary where they overlap"""
+        uploads_per_day = pd.Series(self.uploads_per_day, dtype="int64").sort_index()
+        uploads_per_day.index.name = "date"
+        media_counts = pd.Series(self.media_type, dtype="int64").sort_values(ascending=False)
+
+        return {
+            "pages": self.pages,
+            "total_records": self.total_records,
+            "total_users": len(self.users),
+            "media_type": media_counts,
+            "status": pd.Series(self.status, dtype="int64").sort_values(ascending=False),
+            "category": pd.Series(self.category, dtype="int64").sort_values(ascending=False),
+            "uploads_per_day": uploads_per_day,
+            "images_count": media_counts.get("image", 0),
+            "videos_count": media_counts.get("video", 0),
+            "texts_count": media_counts.get("text", 0),
+            "audios_count": media_counts.get("audio", 0),
+            "total_file_size": self.total_file_size,
+            "avg_file_size": self.total_file_size / max(self.total_records, 1),
+            "file_size_by_date": dict(self.file_size_by_date),
+        }
@@ -0,0 +1,89 @@
+"""Shared-cache scopes: claims are trusted only after the backend accepts the token."""
+import base64
+import json
+import os
+import sys
+import time
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Auth  # noqa: E402
+
+
+def make_token(**claims) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps({"sub": "u1", **claims}).encode()).decode()
+    return f"e30.{payload.rstrip('=')}."
+
+
+class FakeBackend:
+    """Stands in for `api_get`: answers with `status`, or raises when down"""
+
+    def __init__(self):
+        self.status = 200
+        self.calls = 0
+
+    def __call__(self, path, token=None, params=None, timeout=30, retry=True):
+        self.calls += 1
+        assert retry is False, "token checks must not retry"
+        if self.status is None:
+            raise requests.exceptions.ConnectionError("backend down")
+        response = requests.Response()
+        response.status_code = self.status
+        return response
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    fake = FakeBackend()
+    monkeypatch.setattr(Auth, "api_get", fake)
+    Auth._token_checks.invalidate()
+    Auth._verified_scopes.invalidate()
+    return fake
+
+
+def expire_checks():
+    Auth._token_checks.invalidate()
+
+
+def test_accepted_token_gets_role_scope(backend):
+    assert Auth.get_auth_scope(make_token(role="admin")) == "role:admin"
+
+
+def test_outage_keeps_last_verified_scope(backend):
+    token = make_token(role="admin")
+    assert Auth.get_auth_scope(token) == "role:admin"
+
+    backend.status = None
+    expire_checks()
+    assert Auth.get_auth_scope(token) == "role:admin"
+
+
+def test_failed_check_is_cached(backend):
+    backend.status = None
+    token = make_token(role="admin")
+    assert Auth.get_auth_scope(token).startswith("token:")
+    Auth.get_auth_scope(token)
+    assert backend.calls == 1
+
+
+def test_rejected_token_loses_scope(backend):
+    token = make_token(role="admin")
+    Auth.get_auth_scope(token)
+
+    backend.status = 401
+    expire_checks()
+    assert Auth.get_auth_scope(token) == f"token:{Auth.hash_token(token)}"
+
+    # A later outage does not bring the revoked scope back
+    backend.status = None
+    expire_checks()
+    assert Auth.get_auth_scope(token).startswith("token:")
+
+
+def test_expired_token_never_shares(backend):
+    token = make_token(role="admin", exp=time.time() - 60)
+    assert Auth.get_auth_scope(token).startswith("token:")
+    assert backend.calls == 0
@@ -0,0 +1,60 @@
+"""Cohort files with different headers load into one phone-indexed student table."""
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import snapshot_store  # noqa: E402
+from cohorts import (  # noqa: E402
+    COLLEGE_COLUMN,
+    NAME_COLUMN,
+    PHONE_COLUMN,
+    discover_cohort_files,
+    load_students,
+)
+
+
+@pytest.fixture
+def cohort_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot_store, "SNAPSHOT_DIR", str(tmp_path / "snapshots"))
+    pd.DataFrame({
+        "Full Name": ["Asha", "Ravi", "No Phone"],
+        "CreatedAt": ["2025-02-25"] * 3,
+        "Contact Number": ["9000000001", "+91 90000 00002", "n/a"],
+        "Affiliation (College/Company/Organization Name)": ["Alpha", "Alpha", "Alpha"],
+        "Email Address": ["a@x.org", "r@x.org", ""],
+    }).to_csv(tmp_path / "Cohort1.csv", index=False)
+    # ICFAI-style headers, no college column; Ravi's phone again in another format
+    pd.DataFrame({
+        "FirstName": ["Ravi K", "Meena", "Also No Phone"],
+        "Phone Number": ["09000000002", "9000000003", ""],
+        "Email": ["rk@x.org", "m@x.org", ""],
+    }).to_csv(tmp_path / "ICFAI.csv", index=False)
+    return discover_cohort_files(str(tmp_path))
+
+
+def test_aliases_map_to_common_schema(cohort_files):
+    students = load_students(cohort_files)
+    meena = students.loc["9000000003"]
+    assert meena[NAME_COLUMN] == "Meena"
+    assert meena["Email Address"] == "m@x.org"
+    # A cohort without a college column is attributed to the cohort file
+    assert meena[COLLEGE_COLUMN] == "ICFAI" and meena["Cohort"] == "ICFAI"
+
+
+def test_duplicate_phones_keep_the_first_cohort(cohort_files):
+    students = load_students(cohort_files)
+    assert students.index.name == "phone"
+    assert students.index.dropna().is_unique
+    assert students.loc["9000000002", NAME_COLUMN] == "Ravi"
+    assert students.loc["9000000002", PHONE_COLUMN] == "+91 90000 00002"
+
+
+def test_students_without_valid_phone_are_kept_unindexed(cohort_files):
+    students = load_students(cohort_files)
+    unmatched = students[students.index.isna()]
+    assert sorted(unmatched[NAME_COLUMN]) == ["Also No Phone", "No Phone"]
+    assert len(students) == 5
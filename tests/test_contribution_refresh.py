@@ -0,0 +1,79 @@
+"""An incremental contributions refresh must match a full rebuild."""
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import college_overview  # noqa: E402
+from college_overview import (  # noqa: E402
+    CONTRIBUTIONS_PATH,
+    RECORDS_PATH,
+    generate_contribution_data,
+    refresh_contribution_data,
+)
+
+STUDENTS = pd.DataFrame({
+    "Full Name": ["Asha", "Ravi", "Meena", "John", "Lata"],
+    "CreatedAt": ["2025-02-25"] * 5,
+    "Contact Number": ["9000000001", "+91 9000000002", "9000000003", "09000000004", "bad"],
+    "Affiliation (College/Company/Organization Name)": ["A", "A", "B", "B", "C"],
+    "Email Address": [f"s{i}@x.org" for i in range(5)],
+})
+
+
+def write_records(rows):
+    pd.DataFrame(rows, columns=["user_id", "title", "media_type"]).to_csv(RECORDS_PATH, index=False)
+
+
+@pytest.fixture
+def workspace(monkeypatch, tmp_path):
+    """A data/ tree in a temp dir, with users served by a stub"""
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("data/clgdetails")
+    STUDENTS.to_csv("data/clgdetails/Cohort1.csv", index=False)
+    write_records([
+        ("u1", "t", "image"), ("u1", "t", "Video"), ("u2", "t", "audio"), ("u9", "t", "text"),
+    ])
+    users = [{"id": "u1", "phone": "9000000001"}, {"id": "u2", "phone": "9000000002"}]
+    monkeypatch.setattr(college_overview, "fetch_all_users_with_cache", lambda token: users)
+    generate_contribution_data("token")
+    return users
+
+
+def refreshed_then_rebuilt():
+    """contributions_data.csv after a refresh, and after a full rebuild"""
+    messages = []
+    refresh_contribution_data("token", report=messages.append)
+    assert "Updating changed students..." in messages, messages
+    with open(CONTRIBUTIONS_PATH) as f:
+        refreshed = f.read()
+
+    generate_contribution_data("token")
+    with open(CONTRIBUTIONS_PATH) as f:
+        return refreshed, f.read()
+
+
+def test_refresh_after_user_changes_matches_rebuild(workspace):
+    workspace[1]["id"] = "u9"  # Phone now maps to another user
+    workspace.append({"id": "u3", "phone": "9000000003"})  # New registration
+
+    refreshed, rebuilt = refreshed_then_rebuilt()
+    assert refreshed == rebuilt
+    assert "u9" in rebuilt and "u3" in rebuilt
+
+
+def test_refresh_after_records_change_matches_rebuild(workspace):
+    write_records([
+        ("u1", "t", "image"), ("u2", "t", "audio"), ("u2", "t", "image"), ("u2", None, "text"),
+    ])
+
+    refreshed, rebuilt = refreshed_then_rebuilt()
+    assert refreshed == rebuilt
+
+
+def test_no_temp_files_left(workspace):
+    refresh_contribution_data("token")
+    assert not [name for name in os.listdir("data") if name.endswith(".tmp")]
@@ -0,0 +1,153 @@
+"""Delta sync of the month-partitioned local records copy against a fake backend."""
+import base64
+import json
+import os
+import sys
+
+import pandas as pd
+import pytest
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Auth  # noqa: E402
+import records  # noqa: E402
+import records_store  # noqa: E402
+import snapshot_store  # noqa: E402
+from shared_cache import dataset_cache  # noqa: E402
+
+PAGE = 10
+TOKEN = "e30." + base64.urlsafe_b64encode(
+    json.dumps({"sub": "u1", "role": "admin"}).encode()
+).decode().rstrip("=") + "."
+SCOPE = "role:admin"
+
+
+def make_record(i: int, month: int = 1, **fields) -> dict:
+    created = pd.Timestamp(2025, month, 1) + pd.Timedelta(hours=i)
+    return {
+        "uid": f"r{i}",
+        "user_id": f"u{i % 3}",
+        "created_at": created.isoformat(),
+        "updated_at": created.isoformat(),
+        "location": {"lat": i},
+        **fields,
+    }
+
+
+class FakeApi:
+    """`api_get` over an in-memory records table, paged oldest-first
+
+    `status` None takes the backend down (connection errors); any other
+    non-200 status is returned as is.
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.status = 200
+        self.skips = []
+
+    def __call__(self, path, token=None, params=None, timeout=30, retry=True):
+        if self.status is None:
+            raise requests.exceptions.ConnectionError("backend down")
+        response = requests.Response()
+        response.status_code = self.status
+        if self.status == 200:
+            skip, limit = params["skip"], params["limit"]
+            if limit > 1:
+                self.skips.append(skip)
+            response._content = json.dumps(self.rows[skip:skip + limit]).encode()
+        return response
+
+
+@pytest.fixture
+def api(monkeypatch, tmp_path):
+    fake = FakeApi([make_record(i, month=1 + i // 20) for i in range(45)])
+    monkeypatch.setattr(Auth, "api_get", fake)
+    monkeypatch.setattr(records, "api_get", fake)
+    monkeypatch.setattr(records, "RECORDS_PAGE_LIMIT", PAGE)
+    monkeypatch.setattr(records, "RECORDS_FETCH_CONCURRENCY", 1)
+    monkeypatch.setattr(records.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(snapshot_store, "SNAPSHOT_DIR", str(tmp_path))
+    Auth._token_checks.invalidate()
+    Auth._verified_scopes.invalidate()
+    dataset_cache.invalidate()
+    return fake
+
+
+def by_uid(rows):
+    return {row["uid"]: row for row in rows}
+
+
+def test_first_sync_crawls_and_partitions_by_month(api):
+    crawled = records.sync_records_store(TOKEN)
+    assert len(crawled) == 45
+
+    meta = records_store.read_records_store_meta(SCOPE)
+    assert list(meta["partitions"]) == ["2025-01", "2025-02", "2025-03"]
+    assert meta["rows"] == 45
+    assert records.sync_records(TOKEN)[0]["location"] == {"lat": 0}
+
+
+def test_delta_sync_starts_one_page_before_the_tail(api):
+    records.sync_records_store(TOKEN)
+    api.skips.clear()
+    api.rows = api.rows + [make_record(i, month=3) for i in range(45, 48)]
+
+    assert records.sync_records_store(TOKEN) is None
+    assert api.skips == [30, 40]  # 45 known rows: last full page is 40, one page overlap
+    assert len(records.sync_records(TOKEN)) == 48
+
+
+def test_delta_sync_merges_by_uid_and_updated_at(api):
+    records.sync_records_store(TOKEN)
+    newer = {**api.rows[41], "title": "edited", "updated_at": "2026-01-01T00:00:00"}
+    older = {**api.rows[42], "title": "stale", "updated_at": "2000-01-01T00:00:00"}
+    api.rows = api.rows[:41] + [newer, older] + api.rows[43:]
+
+    records.sync_records_store(TOKEN)
+    synced = by_uid(records.sync_records(TOKEN))
+    assert len(synced) == 45
+    assert synced["r41"]["title"] == "edited"
+    assert "title" not in synced["r42"] or synced["r42"]["title"] is None
+    assert records_store.read_records_store_meta(SCOPE)["watermark"] == "2026-01-01T00:00:00"
+
+
+def test_shifted_offsets_fall_back_to_full_crawl(api):
+    records.sync_records_store(TOKEN)
+    api.rows = [make_record(i, month=4) for i in range(100, 140)]
+
+    crawled = records.sync_records_store(TOKEN)
+    assert set(by_uid(crawled)) == {f"r{i}" for i in range(100, 140)}
+    assert list(records_store.read_records_store_meta(SCOPE)["partitions"]) == ["2025-04"]
+
+
+def test_rejected_token_gets_nothing(api):
+    records.sync_records_store(TOKEN)
+    api.status = 401
+    assert records.sync_records_store(TOKEN) == []
+
+
+def test_outage_serves_existing_store(api):
+    records.sync_records_store(TOKEN)
+    api.status = None
+    Auth._token_checks.invalidate()  # The scope check also sees the outage
+
+    assert records.sync_records_store(TOKEN) is None
+    assert len(records.sync_records(TOKEN)) == 45
+
+
+def test_window_reads_only_overlapping_months(api, monkeypatch):
+    records.sync_records_store(TOKEN)
+    read = []
+    original = snapshot_store._read_frame
+    monkeypatch.setattr(
+        snapshot_store, "_read_frame", lambda path, columns=None: read.append(path) or original(path, columns)
+    )
+
+    window = records_store.load_records_window(
+        SCOPE, pd.Timestamp("2025-02-10", tz="UTC"), pd.Timestamp("2025-02-12", tz="UTC")
+    )
+    assert [os.path.basename(path) for path in read] == [f"2025-02{snapshot_store.SNAPSHOT_EXTENSION}"]
+    assert len(window["records"]) == 20 and window["rows"] == 45
+    assert records_store.window_covers(window["span"], pd.Timestamp("2025-02-20", tz="UTC"), None) is False
@@ -0,0 +1,86 @@
+"""Filtered summaries: the rollup cube must agree with scanning the frame."""
+import os
+import sys
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from categories import CATEGORY_ID_TO_NAME  # noqa: E402
+from records_frame import build_records_frame  # noqa: E402
+from summaries import RollupCube, cached_summarize_frame, summarize_frame  # noqa: E402
+
+FILTERS = [
+    {"categories": ["Food", "Images"]},
+    {"media_types": ["image", "audio"]},
+    {"status": ["pending"]},
+    {"date_range": (date(2025, 6, 1), date(2025, 6, 30))},
+    {"date_range": (date(2025, 3, 1), date(2025, 5, 31)), "media_types": ["text"]},
+]
+COMPARED_KEYS = [
+    "total_records", "total_users", "unique_dates", "date_range", "total_file_size",
+    "media_type", "status", "category", "uploads_per_day", "uploads_per_hour",
+    "uploads_per_user", "file_size_by_category",
+]
+
+
+@pytest.fixture(scope="module")
+def frame():
+    rng = np.random.default_rng(3)
+    n = 5000
+    created = pd.Timestamp("2025-01-01", tz="UTC") + pd.to_timedelta(
+        rng.integers(0, 240 * 24 * 3600, n), unit="s"
+    )
+    records = [
+        {
+            "uid": f"r{i}",
+            "user_id": f"u{rng.integers(0, 300)}",
+            "category_id": rng.choice(list(CATEGORY_ID_TO_NAME)),
+            "media_type": rng.choice(["image", "video", "audio", "text"]),
+            "status": rng.choice(["pending", "approved", "rejected"]),
+            "size": int(rng.integers(1, 10_000)),
+            "created_at": created[i].isoformat(),
+        }
+        for i in range(n)
+    ]
+    records[7]["created_at"] = "not a date"
+    return build_records_frame(records)
+
+
+def assert_same(expected, actual):
+    for key in COMPARED_KEYS:
+        old, new = expected[key], actual[key]
+        if isinstance(old, pd.Series):
+            pd.testing.assert_series_equal(
+                old.sort_index(), new.sort_index(),
+                check_names=False, check_index_type=False, check_dtype=False,
+            )
+        elif isinstance(old, dict):
+            assert old.keys() == new.keys(), key
+            assert all(np.isclose(old[k], new[k]) for k in old), key
+        else:
+            assert old == new, key
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_cube_matches_frame_scan(frame, filters):
+    expected = summarize_frame(frame, filters)
+    assert expected is not None and expected["total_records"] > 0
+    assert_same(expected, RollupCube(frame).summarize(filters))
+
+
+def test_date_range_on_sorted_frame(frame):
+    filters = {"date_range": (date(2025, 6, 1), date(2025, 6, 30))}
+    summary = cached_summarize_frame(frame, filters)
+    assert summary is not None
+    assert summary["total_records"] == summarize_frame(frame, filters)["total_records"]
+
+
+def test_cached_summary_keeps_filtered_frame(frame):
+    filters = {"categories": ["Food"], "date_range": (date(2025, 6, 1), date(2025, 6, 30))}
+    summary = cached_summarize_frame(frame, filters)
+    expected = summarize_frame(frame, filters)["df"]
+    assert summary["df"].index.equals(expected.index)
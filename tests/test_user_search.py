@@ -0,0 +1,53 @@
+"""Type-ahead user search by name, phone (with or without country code) and id."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from user_search import UserSearchIndex, normalize_phone  # noqa: E402
+
+USERS = [
+    {"id": "a1", "name": "Asha Rao", "phone": "9876543210"},
+    {"id": "b2", "name": "Ravi Kumar", "phone": "+91 91234 56789"},
+    {"id": "c3", "name": "Meena", "phone": "09123400000"},
+    {"id": "d4", "name": "No Phone", "phone": None},
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return UserSearchIndex(USERS)
+
+
+def ids(users):
+    return [user["id"] for user in users]
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("+91 98765 43210", "9876543210"),
+    ("0091-9876543210", "9876543210"),
+    ("919876543210", "9876543210"),
+    ("09876543210", "9876543210"),
+    ("+91 98", "98"),
+    ("9123", "9123"),  # A bare 91... prefix of a local number is kept
+])
+def test_normalize_phone(raw, expected):
+    assert normalize_phone(raw) == expected
+
+
+@pytest.mark.parametrize("query", ["+91 98765", "+91 98", "+919876543210", "98765", "09876543210"])
+def test_country_code_queries_match(index, query):
+    assert ids(index.search(query)) == ["a1"]
+
+
+def test_stored_country_code_is_ignored(index):
+    assert ids(index.search("91234 56789")) == ["b2"]
+    assert sorted(ids(index.search("+91 9123"))) == ["b2", "c3"]
+
+
+def test_name_and_id_search(index):
+    assert ids(index.search("ravi")) == ["b2"]
+    assert ids(index.search("kum")) == ["b2"]
+    assert ids(index.search("c3")) == ["c3"]
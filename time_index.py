@@ -0,0 +1,109 @@
+# Daily prefix sums over the records timeline: range totals and growth by lookup
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+MEASURES = ("records", "bytes")
+ONE_DAY = pd.Timedelta(days=1)
+
+
+def growth_percent(current: float, previous: float) -> float:
+    """Change from `previous` to `current` in percent (100 when starting from zero)"""
+    if previous == 0:
+        return 100.0 if current > 0 else 0.0
+    return ((current - previous) / previous) * 100
+
+
+class DailyTimeIndex:
+    """Cumulative record counts and bytes per UTC day
+
+    Every day from the first to the last upload gets a bucket, so a day's
+    position is its offset from the first day and the total of any date
+    range is the difference of two prefix sums. Range totals and growth
+    rates cost the same however many records or days there are.
+    """
+
+    def __init__(self, records: pd.Series, sizes: Optional[pd.Series] = None):
+        """`records` (and `sizes`) hold per-day totals keyed by day-normalised timestamps"""
+        records = records[records.index.notna()]
+        self.has_size = sizes is not None
+
+        if records.empty:
+            self.start = None
+            self.days = pd.DatetimeIndex([], tz=getattr(records.index, "tz", None))
+        else:
+            self.start = records.index.min()
+            self.days = pd.date_range(self.start, records.index.max(), freq="D")
+
+        offsets = ((records.index - self.start) // ONE_DAY) if self.start is not None else []
+        counts = np.zeros(len(self.days), dtype=np.int64)
+        counts[np.asarray(offsets, dtype=np.int64)] = records.to_numpy(dtype=np.int64)
+        self.cum_records = np.concatenate([[0], np.cumsum(counts)])
+
+        volume = np.zeros(len(self.days), dtype=np.float64)
+        if self.has_size:
+            sizes = sizes.reindex(records.index).fillna(0)
+            volume[np.asarray(offsets, dtype=np.int64)] = sizes.to_numpy(dtype=np.float64)
+        self.cum_bytes = np.concatenate([[0.0], np.cumsum(volume)])
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def _cumulative(self, measure: str) -> np.ndarray:
+        if measure not in MEASURES:
+            raise ValueError(f"Unknown measure: {measure}")
+        return self.cum_records if measure == "records" else self.cum_bytes
+
+    def _offset(self, day) -> int:
+        """Bucket position of a day, clipped to [0, len]"""
+        day = pd.Timestamp(day)
+        if day.tzinfo is None and self.days.tz is not None:
+            day = day.tz_localize(self.days.tz)
+        offset = (day.normalize() - self.start) // ONE_DAY
+        return int(min(max(offset, 0), len(self)))
+
+    def range_total(self, start=None, end=None, measure: str = "records") -> float:
+        """Total over the days from `start` to `end`, both inclusive (open when None)"""
+        cumulative = self._cumulative(measure)
+        if self.start is None:
+            return cumulative[0]
+        lo = 0 if start is None else self._offset(start)
+        hi = len(self) if end is None else self._offset(pd.Timestamp(end) + ONE_DAY)
+        return cumulative[max(hi, lo)] - cumulative[lo]
+
+    def daily(self, measure: str = "records") -> pd.Series:
+        """Per-day totals on the days that had uploads"""
+        active = np.diff(self.cum_records) > 0
+        values = np.diff(self._cumulative(measure))
+        return pd.Series(values[active], index=self.days[active])
+
+    def active_days(self) -> int:
+        return int(np.count_nonzero(np.diff(self.cum_records)))
+
+    def growth_rate(self, period: str = "weekly", measure: str = "records") -> float:
+        """Growth of the latest calendar week/month over the one before, in percent
+
+        Weeks run Monday to Sunday. With fewer than two upload days, or when
+        all uploads fall in the latest period, the growth is 0.
+        """
+        if self.active_days() < 2 or (measure == "bytes" and not self.has_size):
+            return 0.0
+
+        last = self.days[-1]
+        if period == "weekly":
+            current_start = last - last.dayofweek * ONE_DAY
+            previous_start = current_start - 7 * ONE_DAY
+        elif period == "monthly":
+            current_start = last.replace(day=1)
+            previous_start = (current_start - ONE_DAY).replace(day=1)
+        else:
+            # Latest two upload days
+            daily = self.daily(measure)
+            return growth_percent(daily.iloc[-1], daily.iloc[-2])
+
+        if self.start >= current_start:
+            return 0.0
+        current = self.range_total(current_start, last, measure)
+        previous = self.range_total(previous_start, current_start - ONE_DAY, measure)
+        return growth_percent(current, previous)
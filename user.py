@@ -5,10 +5,16 @@ from asyncio.log import logger
 import time
 from typing import Dict, List, Optional
 
+import pandas as pd
 import requests
 
-from Auth import decode_jwt_token,clear_auth_from_browser,save_auth_to_browser
-from records import fetch_all_records
+from api_client import api_get, api_post
+from Auth import decode_jwt_token,clear_auth_from_browser,save_auth_to_browser,get_auth_scope
+from records_frame import get_records_frame
+from shared_cache import SharedCache, dataset_cache
+
+# Users tables and per-user last upload times, built once per dataset
+_activity_cache = SharedCache(max_entries=8, ttl=600)
 
 
 def logout_user():
@@ -48,12 +54,11 @@ def login_user(phone: str, password: str) -> Optional[Dict]:
         status_text.text("🔐 Authenticating credentials...")
         progress_bar.progress(25)
 
-        response = requests.post(
-            "https://backend2.swecha.org/api/v1/auth/login",
+        response = api_post(
+            "/auth/login",
             json={"phone": phone, "password": password},
-            headers={"accept": "application/json", "Content-Type": "application/json"},
             timeout=30,
-        )        
+        )
 
         progress_bar.progress(75)
         status_text.text("✅ Authentication successful!")
@@ -110,10 +115,9 @@ def login_user(phone: str, password: str) -> Optional[Dict]:
 def request_otp(phone: str) -> bool:
     """Request OTP for login"""
     try:
-        response = requests.post(
-            "https://backend2.swecha.org/api/v1/auth/send-otp",
+        response = api_post(
+            "/auth/send-otp",
             json={"phone_number": phone},
-            headers={"accept": "application/json", "Content-Type": "application/json"},
             timeout=30,
         )
         response.raise_for_status()
@@ -126,10 +130,9 @@ def request_otp(phone: str) -> bool:
 def verify_otp(phone: str, otp: str) -> Optional[Dict]:
     """Verify OTP and get token"""
     try:
-        response = requests.post(
-            "https://backend2.swecha.org/api/v1/auth/verify-otp",
+        response = api_post(
+            "/auth/verify-otp",
             json={"phone_number": phone, "otp_code": otp,"has_given_consent": True},
-            headers={"accept": "application/json", "Content-Type": "application/json"},
             timeout=30,
         )
         response.raise_for_status()
@@ -151,8 +154,6 @@ def fetch_all_users(token: str) -> List[Dict]:
     limit = 1000
     page = 1
 
-    headers = {"Authorization": f"Bearer {token}", "Accept": "application/json"}
-
     try:
         # Create progress indicators
         progress_bar = st.progress(0)
@@ -163,7 +164,7 @@ def fetch_all_users(token: str) -> List[Dict]:
         estimated_pages = (estimated_total_users // limit) + 1
 
         while True:
-            url = f"https://backend2.swecha.org/api/v1/users/?skip={skip}&limit={limit}"
+            params = {"skip": skip, "limit": limit}
 
             # Update progress
             progress_percentage = min(
@@ -174,7 +175,7 @@ def fetch_all_users(token: str) -> List[Dict]:
                 f"🔄 Loading users... Page {page} ({len(all_users)} users loaded)"
             )
 
-            response = requests.get(url, headers=headers, timeout=30)
+            response = api_get("/users/", token, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
 
@@ -256,34 +257,65 @@ def fetch_all_users(token: str) -> List[Dict]:
 
 
 
-def find_users_with_zero_records(token: str) -> List[Dict]:
-    """Find users who have zero records uploaded"""
-    try:
-        # Fetch all users and all records
-        all_users = fetch_all_users(token)
-        all_records = fetch_all_records(token)
-        
-        if not all_users or not all_records:
-            st.error("Failed to fetch required data")
-            return []
-        
-        # Get set of user IDs who have uploaded records
-        users_with_records = set()
-        for record in all_records:
-            if record.get("user_id"):
-                users_with_records.add(record["user_id"])
-        
-        # Find users with zero records
-        users_with_zero_records = []
-        for user in all_users:
-            user_id = user.get("id")
-            if user_id and user_id not in users_with_records:
-                users_with_zero_records.append(user)
-        
-        return users_with_zero_records
-        
-    except Exception as e:
-        logger.error(f"Error finding users with zero records: {e}")
-        st.error(f"Error: {e}")
+def fetch_all_users_with_cache(token: str, use_cache: bool = True) -> List[Dict]:
+    """Fetch all users through the process-wide cache shared by all sessions"""
+    if not token:
+        st.error("Token is required")
         return []
 
+    cache_key = ("all_users", get_auth_scope(token))
+    if not use_cache:
+        dataset_cache.invalidate(lambda key: key == cache_key)
+
+    return dataset_cache.get_or_load(cache_key, lambda: fetch_all_users(token))
+
+
+def get_users_frame(users: List[Dict]) -> pd.DataFrame:
+    """Users as a frame indexed by user id, built once per users list"""
+    key = ("users_frame", id(users))
+    entry = _activity_cache.get(key)
+    if entry is not None and entry[0] is users:
+        return entry[1]
+
+    frame = pd.DataFrame(users)
+    if "id" in frame.columns:
+        frame = frame[frame["id"].notna() & (frame["id"] != "")].set_index("id", drop=False)
+    _activity_cache.set(key, (users, frame))
+    return frame
+
+
+def last_upload_by_user(records: List[Dict]) -> pd.Series:
+    """Latest upload time (UTC) per user id, from the canonical records frame"""
+    frame = get_records_frame(records)
+    key = ("last_upload", frame.attrs.get("version"), id(records))
+    return _activity_cache.get_or_load(
+        key,
+        lambda: frame[frame["user_id"].notna()].groupby("user_id")["uploaded_at"].max(),
+    )
+
+
+def find_inactive_users(
+    users: List[Dict],
+    records: List[Dict],
+    inactive_days: Optional[int] = None,
+    now: Optional[pd.Timestamp] = None,
+) -> pd.DataFrame:
+    """Anti-join of users against uploaders
+
+    Returns users who never uploaded, plus (with `inactive_days`) users
+    whose latest upload is older than that many days, with a `last_upload`
+    column (NaT for users with no uploads).
+    """
+    users_df = get_users_frame(users)
+    if users_df.empty or "id" not in users_df.columns:
+        return users_df
+
+    last_upload = last_upload_by_user(records) if records else pd.Series(dtype="datetime64[ns, UTC]")
+    last_seen = last_upload.reindex(users_df.index)
+
+    inactive = last_seen.isna()
+    if inactive_days:
+        now = pd.Timestamp.now(tz="UTC") if now is None else pd.Timestamp(now)
+        inactive |= last_seen < now - pd.Timedelta(days=inactive_days)
+
+    return users_df[inactive.values].assign(last_upload=last_seen[inactive].values)
@@ -0,0 +1,144 @@
+# Type-ahead search over users by name, phone number or user id
+import heapq
+import re
+from bisect import bisect_left
+from typing import Dict, List
+
+import numpy as np
+
+from shared_cache import SharedCache
+
+NGRAM_SIZE = 3
+DEFAULT_MATCH_LIMIT = 20
+PHONE_COUNTRY_CODE = "91"
+PHONE_DIGITS = 10
+
+# Search indexes, one per users list
+_index_cache = SharedCache(max_entries=4, ttl=3600)
+
+
+def normalize_phone(text: str) -> str:
+    """Digits of a phone number without the +91 country code or leading zeros
+
+    The code is dropped when written as "+91"/"0091", or when it precedes
+    a full 10-digit number.
+    """
+    text = str(text or "").strip()
+    digits = re.sub(r"\D", "", text)
+    international = text.startswith("+") or digits.startswith("00")
+    digits = digits.lstrip("0")
+    if digits.startswith(PHONE_COUNTRY_CODE) and (
+        international or len(digits) == len(PHONE_COUNTRY_CODE) + PHONE_DIGITS
+    ):
+        digits = digits[len(PHONE_COUNTRY_CODE):]
+    return digits.lstrip("0")
+
+
+def normalize_query(text: str) -> str:
+    """Lowercase, collapse whitespace; phone-like input is normalized like stored phones"""
+    text = re.sub(r"\s+", " ", str(text or "")).strip().lower()
+    if re.fullmatch(r"[+\d\s()-]+", text):
+        text = normalize_phone(text)
+    return text
+
+
+class UserSearchIndex:
+    """Trigram and prefix index over user names, phones and ids
+
+    Queries of three or more characters intersect trigram posting lists
+    and verify substring matches on the few candidates left; shorter
+    queries binary-search a sorted list of word prefixes. Either way the
+    work depends on the number of matches, not on the number of users.
+    """
+
+    def __init__(self, users: List[Dict]):
+        self.users = [user for user in users if user.get("id")]
+        self.haystacks = []
+        postings: Dict[str, List[int]] = {}
+        words = []
+
+        for position, user in enumerate(self.users):
+            name = normalize_query(user.get("name") or "")
+            raw_phone = re.sub(r"\D", "", str(user.get("phone") or ""))
+            phone = normalize_phone(user.get("phone") or "")
+            user_id = str(user["id"]).lower()
+            phones = (phone, raw_phone) if raw_phone != phone else (phone,)
+            haystack = " | ".join(part for part in (name, *phones, user_id) if part)
+            self.haystacks.append(haystack)
+
+            for gram in {haystack[i:i + NGRAM_SIZE] for i in range(len(haystack) - NGRAM_SIZE + 1)}:
+                postings.setdefault(gram, []).append(position)
+            # Phones are indexed as stored and without country code or leading zeros
+            for word in set(name.split()) | {name, phone, raw_phone, raw_phone[-PHONE_DIGITS:], user_id}:
+                if word:
+                    words.append((word, position))
+
+        self.postings = {gram: np.array(ids, dtype=np.int64) for gram, ids in postings.items()}
+        words.sort()
+        self.words = [word for word, _ in words]
+        self.word_positions = [position for _, position in words]
+
+    def __len__(self) -> int:
+        return len(self.users)
+
+    def _prefix_candidates(self, query: str, limit: int) -> List[int]:
+        found = []
+        seen = set()
+        i = bisect_left(self.words, query)
+        while i < len(self.words) and self.words[i].startswith(query) and len(found) < limit:
+            position = self.word_positions[i]
+            if position not in seen:
+                seen.add(position)
+                found.append(position)
+            i += 1
+        return found
+
+    def _ngram_candidates(self, query: str) -> np.ndarray:
+        grams = {query[i:i + NGRAM_SIZE] for i in range(len(query) - NGRAM_SIZE + 1)}
+        lists = []
+        for gram in grams:
+            posting = self.postings.get(gram)
+            if posting is None:
+                return np.array([], dtype=np.int64)
+            lists.append(posting)
+
+        lists.sort(key=len)
+        candidates = lists[0]
+        for posting in lists[1:]:
+            candidates = np.intersect1d(candidates, posting, assume_unique=True)
+            if len(candidates) == 0:
+                break
+        return candidates
+
+    def search(self, query: str, limit: int = DEFAULT_MATCH_LIMIT) -> List[Dict]:
+        """Up to `limit` users matching the query; prefix matches rank first"""
+        query = normalize_query(query)
+        if not query:
+            return []
+
+        if len(query) < NGRAM_SIZE:
+            return [self.users[p] for p in self._prefix_candidates(query, limit)]
+
+        matches = (
+            int(p) for p in self._ngram_candidates(query) if query in self.haystacks[p]
+        )
+        top = heapq.nsmallest(
+            limit, matches, key=lambda p: (not self._starts_word(p, query), self.haystacks[p])
+        )
+        return [self.users[p] for p in top]
+
+    def _starts_word(self, position: int, query: str) -> bool:
+        haystack = self.haystacks[position]
+        return haystack.startswith(query) or f" {query}" in haystack
+
+
+def get_user_search_index(users: List[Dict]) -> UserSearchIndex:
+    """Search index for a users list, built once per list"""
+    key = id(users)
+    entry = _index_cache.get(key)
+    if entry is not None and entry[0] is users:
+        return entry[1]
+
+    index = UserSearchIndex(users)
+    _index_cache.set(key, (users, index))
+    return index